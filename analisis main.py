@@ -5,18 +5,10 @@ import seaborn as sns
 import matplotlib.pyplot as plt
 
 from scipy.stats import pearsonr, spearmanr, chi2_contingency
-import nltk
-from nltk.corpus import stopwords
-import string
 from collections import Counter
 
-# ========================== INISIALISASI NLTK ==========================
-
-# Hanya butuh stopwords, tidak lagi pakai word_tokenize (punkt)
-try:
-    _ = stopwords.words("english")
-except LookupError:
-    nltk.download("stopwords")
+from survey_io import load_survey
+from survey_text import preprocess_text_series
 
 # ========================== PAGE CONFIG & CSS ==========================
 
@@ -277,35 +269,7 @@ def get_text(lang: str, key: str) -> str:
 # ========================== HELPER FUNCTIONS ==========================
 
 def load_data(uploaded_file):
-    if uploaded_file is None:
-        return None
-    name = uploaded_file.name.lower()
-    try:
-        if name.endswith(".csv"):
-            return pd.read_csv(uploaded_file)
-        if name.endswith(".xls") or name.endswith(".xlsx"):
-            return pd.read_excel(uploaded_file)
-    except Exception:
-        return None
-    return None
-
-
-def preprocess_text_series(series: pd.Series) -> pd.Series:
-    """Preprocessing teks tanpa word_tokenize (pakai split spasi)."""
-    eng_stop = set(stopwords.words("english"))
-    punct_table = str.maketrans("", "", string.punctuation)
-
-    def _clean(text):
-        if pd.isna(text):
-            return []
-        text = str(text).lower()
-        text = text.translate(punct_table)
-        # tokenisasi sederhana: split berdasarkan spasi
-        tokens = text.split()
-        tokens = [t for t in tokens if t.isalpha() and t not in eng_stop]
-        return tokens
-
-    return series.apply(_clean)
+    return load_survey(uploaded_file)
 
 
 def descriptive_stats(series: pd.Series) -> pd.DataFrame:
@@ -546,7 +510,7 @@ st.write("")
 # ========================== TEXT PREPROCESSING ==========================
 
 with st.expander(get_text(current_lang, "text_processing_subheader"), expanded=False):
-    text_cols = df.select_dtypes(include=["object", "string"]).columns.tolist()
+    text_cols = df.select_dtypes(include=["object", "string", "category"]).columns.tolist()
     if not text_cols:
         st.warning(get_text(current_lang, "no_text_columns"))
     else:
@@ -4,6 +4,10 @@ import seaborn as sns
 import matplotlib.pyplot as plt
 from scipy import stats  # make sure scipy is installed: pip install scipy
 
+from survey_charts import draw_histogram
+from survey_io import frame_fingerprint, load_survey
+from survey_stats import cached_histogram, decode_likert
+
 st.set_page_config(page_title="Survey Analysis X and Y", layout="wide")
 
 st.title("Digital Payment Survey Analysis: X and Y")
@@ -14,9 +18,8 @@ st.title("Digital Payment Survey Analysis: X and Y")
 st.sidebar.header("Upload Data")
 uploaded_file = st.sidebar.file_uploader("Upload survei.csv file", type=["csv"])
 
-if uploaded_file is not None:
-    df = pd.read_csv(uploaded_file)
-else:
+df = load_survey(uploaded_file)
+if df is None:
     st.info("Please upload survei.csv from the sidebar.")
     st.stop()
 
@@ -58,10 +61,7 @@ st.markdown("Note: Make sure the selected items are Likert-scale questions that
 
 # Helper function: convert text like "5 = Strongly agree" -> 5
 def likert_to_num(df_sub):
-    out = df_sub.copy()
-    for c in out.columns:
-        out[c] = out[c].astype(str).str.extract(r"(\\d+)").astype(float)
-    return out
+    return decode_likert(df_sub)
 
 # Create composite scores if columns are selected
 if cols_x:
@@ -195,7 +195,10 @@ if numeric_cols:
         with col1:
             st.markdown(f"**Histogram – {pilihan_plot_col}**")
             fig_h, ax_h = plt.subplots(figsize=(5, 4))
-            sns.histplot(seri_plot, kde=True, bins=10, ax=ax_h, color="skyblue")
+            # X_total / Y_total depend on the chosen items, so they are part of the key
+            hist_key = (frame_fingerprint(df), tuple(cols_x), tuple(cols_y))
+            hist = cached_histogram(hist_key, seri_plot, bins=10)
+            draw_histogram(ax_h, hist, color="skyblue", alpha=0.6, edgecolor="skyblue")
             ax_h.set_xlabel(pilihan_plot_col)
             ax_h.set_ylabel("Frequency")
             st.pyplot(fig_h)
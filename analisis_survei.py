@@ -4,9 +4,6 @@ import numpy as np
 import seaborn as sns
 import matplotlib.pyplot as plt
 from scipy.stats import pearsonr, spearmanr, chi2_contingency, normaltest
-import nltk
-from nltk.corpus import stopwords
-import string
 from collections import Counter
 import time
 
@@ -25,11 +22,9 @@ from reportlab.platypus import (
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from io import BytesIO
 
-# --------------------------- NLTK INIT ---------------------------
-try:
-    _ = stopwords.words("english")
-except LookupError:
-    nltk.download("stopwords")
+from i18n import text_table
+from survey_io import filter_rows, load_survey
+from survey_text import preprocess_text_series
 
 # --------------------------- SESSION STATE ---------------------------
 if "dark_mode" not in st.session_state:
@@ -158,486 +153,14 @@ if st.session_state["dark_mode"]:
     )
 
 # --------------------------- MULTI-LANGUAGE TEXTS ---------------------------
-TEXTS = {
-    "EN": {
-        "title": "📊 Survey Data Analysis",
-        "subtitle": "Upload your survey file (CSV/Excel) and explore descriptive statistics, visualizations, and correlation tests interactively.",
-        "upload_subheader": "📁 Upload Survey Data",
-        "upload_label": "Drag & drop file here or click to browse (CSV, XLS, XLSX)",
-        "data_preview": "Data Preview (up to first 1000 rows)",
-        "text_processing_subheader": "📝 Text Preprocessing",
-        "text_columns_detected": "Detected text columns:",
-        "select_text_col": "Select a text column to process",
-        "no_text_columns": "No text-type columns detected.",
-        "text_processing_note": "Text will be lowercased, punctuation removed, tokenized (split by spaces), and English stopwords removed.",
-        "sample_tokens": "Sample of processed tokens",
-        "top_words": "Top 10 Words by Frequency",
-        "stats_subheader": "📈 Descriptive Statistics & Distribution",
-        "select_numeric_col": "Select a numeric column for statistics & plots",
-        "no_numeric_cols": "No numeric columns available.",
-        "desc_stats": "Descriptive statistics for the selected column",
-        "freq_table_subheader": "📊 Categorical Frequency Table",
-        "select_categorical_col": "Select a categorical column for frequency table",
-        "no_categorical_cols": "No categorical columns available.",
-        "freq_count": "Count",
-        "freq_percent": "Percent (%)",
-        "visual_subheader": "📉 Data Visualizations",
-        "histogram": "Histogram",
-        "boxplot": "Boxplot",
-        "correlation_subheader": "🔗 Correlation & Statistical Tests",
-        "pearson_header": "Pearson Correlation",
-        "spearman_header": "Spearman Rank Correlation",
-        "chi_header": "Chi-square Test",
-        "select_x_numeric": "Select X variable (numeric)",
-        "select_y_numeric": "Select Y variable (numeric)",
-        "not_enough_numeric": "Not enough numeric columns for this analysis.",
-        "pearson_result": "Pearson Correlation Result",
-        "spearman_result": "Spearman Rank Correlation Result",
-        "corr_coef": "Correlation coefficient (r)",
-        "p_value": "p-value",
-        "interpretation": "Interpretation",
-        "select_x_cat": "Select X variable (categorical)",
-        "select_y_cat": "Select Y variable (categorical)",
-        "not_enough_categorical": "Not enough categorical columns for Chi-square test.",
-        "chi_square_result": "Chi-square Test Result",
-        "chi_square_stat": "Chi-square statistic",
-        "chi_square_df": "Degrees of freedom (df)",
-        "chi_square_p": "p-value",
-        "alpha_note": "Significance tested at α = 0.05.",
-        "significant_assoc": "There is a statistically significant association between the two variables.",
-        "no_significant_assoc": "There is no statistically significant association between the two variables.",
-        "corr_direction_positive": "Positive relationship: as X increases, Y tends to increase.",
-        "corr_direction_negative": "Negative relationship: as X increases, Y tends to decrease.",
-        "corr_direction_zero": "No clear direction of relationship (near zero).",
-        "corr_strength_none": "Virtually no relationship.",
-        "corr_strength_weak": "Weak relationship.",
-        "corr_strength_moderate": "Moderate relationship.",
-        "corr_strength_strong": "Strong relationship.",
-        "warning_select_valid": "Please select a valid combination of columns.",
-        "header_github": "Fork on GitHub",
-        "nav_desc": "Descriptive Stats",
-        "nav_visual": "Visualizations",
-        "nav_corr": "Correlations & Tests",
-        "nav_text": "Text Processing",
-        "export_title": "Export Report",
-        "export_desc": "Generate a complete PDF with all descriptive stats, normality test, histograms, boxplots, correlations, and text analysis summary.",
-        "export_button": "Generate PDF report",
-        "export_filename": "survey_full_report.pdf",
-        "pdf_title": "Survey Data Full Report",
-        "pdf_section_numdist": "1. Numeric Variables - Distributions",
-        "pdf_section_scatter": "2. Scatter Plots - Relationships",
-        "pdf_section_catbar": "3. Categorical Variables - Bar Charts",
-        "pdf_section_numfull": "4. Numeric Variables - Full Statistics",
-        "pdf_section_catfreq": "5. Categorical Variables - Frequency Tables",
-        "pdf_section_corr": "6. Correlation Analysis",
-        "pdf_section_text": "7. Text Analysis - Top Words",
-        "pdf_notext": "No text data to analyze.",
-    },
-    "ID": {
-        "title": "📊 Analisis Data Survei",
-        "subtitle": "Unggah file survei (CSV/Excel) dan jelajahi statistik deskriptif, visualisasi, serta uji korelasi secara interaktif.",
-        "upload_subheader": "📁 Unggah Data Survei",
-        "upload_label": "Tarik & letakkan file di sini atau klik untuk memilih (CSV, XLS, XLSX)",
-        "data_preview": "Pratinjau Data (maksimal 1000 baris pertama)",
-        "text_processing_subheader": "📝 Pemrosesan Teks",
-        "text_columns_detected": "Kolom teks terdeteksi:",
-        "select_text_col": "Pilih kolom teks untuk diproses",
-        "no_text_columns": "Tidak ada kolom bertipe teks.",
-        "text_processing_note": "Teks akan di-lowercase, tanda baca dihapus, dipisah per kata, dan stopwords bahasa Inggris dihapus.",
-        "sample_tokens": "Contoh token yang telah diproses",
-        "top_words": "10 Kata Teratas berdasarkan Frekuensi",
-        "stats_subheader": "📈 Statistik Deskriptif & Distribusi",
-        "select_numeric_col": "Pilih kolom numerik untuk statistik & grafik",
-        "no_numeric_cols": "Tidak ada kolom numerik.",
-        "desc_stats": "Statistik deskriptif untuk kolom yang dipilih",
-        "freq_table_subheader": "📊 Tabel Frekuensi Kategorikal",
-        "select_categorical_col": "Pilih kolom kategorikal untuk tabel frekuensi",
-        "no_categorical_cols": "Tidak ada kolom kategorikal.",
-        "freq_count": "Frekuensi",
-        "freq_percent": "Persentase (%)",
-        "visual_subheader": "📉 Visualisasi Data",
-        "histogram": "Histogram",
-        "boxplot": "Boxplot",
-        "correlation_subheader": "🔗 Korelasi & Uji Statistik",
-        "pearson_header": "Korelasi Pearson",
-        "spearman_header": "Korelasi Spearman",
-        "chi_header": "Uji Chi-square",
-        "select_x_numeric": "Pilih variabel X (numerik)",
-        "select_y_numeric": "Pilih variabel Y (numerik)",
-        "not_enough_numeric": "Kolom numerik tidak mencukupi untuk analisis ini.",
-        "pearson_result": "Hasil Korelasi Pearson",
-        "spearman_result": "Hasil Korelasi Spearman",
-        "corr_coef": "Koefisien korelasi (r)",
-        "p_value": "p-value",
-        "interpretation": "Interpretasi",
-        "select_x_cat": "Pilih variabel X (kategorikal)",
-        "select_y_cat": "Pilih variabel Y (kategorikal)",
-        "not_enough_categorical": "Kolom kategorikal tidak mencukupi untuk uji Chi-square.",
-        "chi_square_result": "Hasil Uji Chi-square",
-        "chi_square_stat": "Statistik Chi-square",
-        "chi_square_df": "Derajat bebas (df)",
-        "chi_square_p": "p-value",
-        "alpha_note": "Signifikansi diuji pada α = 0,05.",
-        "significant_assoc": "Terdapat hubungan yang signifikan secara statistik antara kedua variabel.",
-        "no_significant_assoc": "Tidak terdapat hubungan yang signifikan secara statistik antara kedua variabel.",
-        "corr_direction_positive": "Hubungan positif: ketika X naik, Y cenderung naik.",
-        "corr_direction_negative": "Hubungan negatif: ketika X naik, Y cenderung turun.",
-        "corr_direction_zero": "Tidak ada arah hubungan yang jelas (mendekati nol).",
-        "corr_strength_none": "Hampir tidak ada hubungan.",
-        "corr_strength_weak": "Hubungan lemah.",
-        "corr_strength_moderate": "Hubungan sedang.",
-        "corr_strength_strong": "Hubungan kuat.",
-        "warning_select_valid": "Silakan pilih kombinasi kolom yang valid.",
-        "header_github": "Fork di GitHub",
-        "nav_desc": "Statistik Deskriptif",
-        "nav_visual": "Visualisasi",
-        "nav_corr": "Korelasi & Uji",
-        "nav_text": "Pemrosesan Teks",
-        "export_title": "Ekspor Laporan",
-        "export_desc": "Buat PDF lengkap berisi statistik deskriptif, uji normalitas, histogram, boxplot, korelasi, dan ringkasan analisis teks.",
-        "export_button": "Buat laporan PDF",
-        "export_filename": "laporan_survei_lengkap.pdf",
-        "pdf_title": "Laporan Lengkap Data Survei",
-        "pdf_section_numdist": "1. Variabel Numerik - Distribusi",
-        "pdf_section_scatter": "2. Scatter Plot - Hubungan",
-        "pdf_section_catbar": "3. Variabel Kategorikal - Diagram Batang",
-        "pdf_section_numfull": "4. Variabel Numerik - Statistik Lengkap",
-        "pdf_section_catfreq": "5. Variabel Kategorikal - Tabel Frekuensi",
-        "pdf_section_corr": "6. Analisis Korelasi",
-        "pdf_section_text": "7. Analisis Teks - Kata Teratas",
-        "pdf_notext": "Tidak ada data teks untuk dianalisis.",
-    },
-    "JP": {  # Japanese
-        "title": "📊 アンケートデータ分析",
-        "subtitle": "アンケートファイル（CSV/Excel）をアップロードして、記述統計・可視化・相関テストをインタラクティブに確認できます。",
-        "upload_subheader": "📁 アンケートデータのアップロード",
-        "upload_label": "ここにファイルをドラッグ＆ドロップ、またはクリックして選択（CSV, XLS, XLSX）",
-        "data_preview": "データプレビュー（先頭1000行まで）",
-        "text_processing_subheader": "📝 テキスト前処理",
-        "text_columns_detected": "検出されたテキスト列：",
-        "select_text_col": "前処理するテキスト列を選択",
-        "no_text_columns": "テキスト型の列が見つかりません。",
-        "text_processing_note": "テキストは小文字化され、句読点が削除され、スペースで分割され、英語のストップワードが除去されます。",
-        "sample_tokens": "前処理されたトークンのサンプル",
-        "top_words": "出現頻度トップ10の単語",
-        "stats_subheader": "📈 記述統計と分布",
-        "select_numeric_col": "統計・グラフ用の数値列を選択",
-        "no_numeric_cols": "利用可能な数値列がありません。",
-        "desc_stats": "選択された列の記述統計",
-        "freq_table_subheader": "📊 カテゴリ頻度表",
-        "select_categorical_col": "頻度表を作成するカテゴリ列を選択",
-        "no_categorical_cols": "カテゴリ列がありません。",
-        "freq_count": "度数",
-        "freq_percent": "割合（％）",
-        "visual_subheader": "📉 データの可視化",
-        "histogram": "ヒストグラム",
-        "boxplot": "箱ひげ図",
-        "correlation_subheader": "🔗 相関と統計的検定",
-        "pearson_header": "ピアソンの相関",
-        "spearman_header": "スピアマンの順位相関",
-        "chi_header": "カイ二乗検定",
-        "select_x_numeric": "X変数（数値）を選択",
-        "select_y_numeric": "Y変数（数値）を選択",
-        "not_enough_numeric": "この分析に必要な数値列が不足しています。",
-        "pearson_result": "ピアソン相関の結果",
-        "spearman_result": "スピアマン相関の結果",
-        "corr_coef": "相関係数 (r)",
-        "p_value": "p値",
-        "interpretation": "解釈",
-        "select_x_cat": "X変数（カテゴリ）を選択",
-        "select_y_cat": "Y変数（カテゴリ）を選択",
-        "not_enough_categorical": "カイ二乗検定に必要なカテゴリ列が不足しています。",
-        "chi_square_result": "カイ二乗検定の結果",
-        "chi_square_stat": "カイ二乗統計量",
-        "chi_square_df": "自由度 (df)",
-        "chi_square_p": "p値",
-        "alpha_note": "有意水準 α = 0.05 で検定しています。",
-        "significant_assoc": "2つの変数の間に統計的に有意な関係があります。",
-        "no_significant_assoc": "2つの変数の間に統計的に有意な関係はありません。",
-        "corr_direction_positive": "正の関係：Xが増加するとYも増加する傾向があります。",
-        "corr_direction_negative": "負の関係：Xが増加するとYは減少する傾向があります。",
-        "corr_direction_zero": "明確な関係の方向がありません（ほぼ0）。",
-        "corr_strength_none": "ほとんど関係がありません。",
-        "corr_strength_weak": "弱い関係です。",
-        "corr_strength_moderate": "中程度の関係です。",
-        "corr_strength_strong": "強い関係です。",
-        "warning_select_valid": "有効な列の組み合わせを選択してください。",
-        "header_github": "GitHubでフォーク",
-        "nav_desc": "記述統計",
-        "nav_visual": "可視化",
-        "nav_corr": "相関・検定",
-        "nav_text": "テキスト処理",
-        "export_title": "レポートのエクスポート",
-        "export_desc": "記述統計・正規性検定・ヒストグラム・箱ひげ図・相関・テキスト分析サマリーを含むPDFレポートを生成します。",
-        "export_button": "PDFレポートを生成",
-        "export_filename": "survey_full_report_jp.pdf",
-        "pdf_title": "アンケート完全レポート",
-        "pdf_section_numdist": "1. 数値変数 - 分布",
-        "pdf_section_scatter": "2. 散布図 - 関係",
-        "pdf_section_catbar": "3. カテゴリ変数 - 棒グラフ",
-        "pdf_section_numfull": "4. 数値変数 - 詳細統計",
-        "pdf_section_catfreq": "5. カテゴリ変数 - 度数表",
-        "pdf_section_corr": "6. 相関分析",
-        "pdf_section_text": "7. テキスト分析 - 上位語",
-        "pdf_notext": "分析できるテキストデータがありません。",
-    },
-    "KR": {  # Korean
-        "title": "📊 설문 데이터 분석",
-        "subtitle": "설문 파일(CSV/Excel)을 업로드하고 기술통계, 시각화, 상관분석을 인터랙티브하게 탐색할 수 있습니다.",
-        "upload_subheader": "📁 설문 데이터 업로드",
-        "upload_label": "여기에 파일을 드래그 앤 드롭하거나 클릭하여 선택하세요 (CSV, XLS, XLSX)",
-        "data_preview": "데이터 미리보기 (최대 첫 1000행)",
-        "text_processing_subheader": "📝 텍스트 전처리",
-        "text_columns_detected": "감지된 텍스트 열:",
-        "select_text_col": "전처리할 텍스트 열 선택",
-        "no_text_columns": "텍스트 형식의 열이 없습니다.",
-        "text_processing_note": "텍스트는 소문자로 변환되고, 구두점이 제거되며, 공백 기준으로 분할되고, 영어 불용어가 제거됩니다.",
-        "sample_tokens": "전처리된 토큰 샘플",
-        "top_words": "출현 빈도 상위 10개 단어",
-        "stats_subheader": "📈 기술통계 및 분포",
-        "select_numeric_col": "통계/그래프용 숫자 열 선택",
-        "no_numeric_cols": "사용 가능한 숫자 열이 없습니다.",
-        "desc_stats": "선택한 열의 기술통계",
-        "freq_table_subheader": "📊 범주형 빈도표",
-        "select_categorical_col": "빈도표를 만들 범주형 열 선택",
-        "no_categorical_cols": "범주형 열이 없습니다.",
-        "freq_count": "빈도",
-        "freq_percent": "비율(%)",
-        "visual_subheader": "📉 데이터 시각화",
-        "histogram": "히스토그램",
-        "boxplot": "박스플롯",
-        "correlation_subheader": "🔗 상관관계 및 통계 검정",
-        "pearson_header": "피어슨 상관",
-        "spearman_header": "스피어만 순위 상관",
-        "chi_header": "카이제곱 검정",
-        "select_x_numeric": "X 변수(숫자)를 선택",
-        "select_y_numeric": "Y 변수(숫자)를 선택",
-        "not_enough_numeric": "이 분석에 필요한 숫자 열이 부족합니다.",
-        "pearson_result": "피어슨 상관 결과",
-        "spearman_result": "스피어만 상관 결과",
-        "corr_coef": "상관계수 (r)",
-        "p_value": "p-값",
-        "interpretation": "해석",
-        "select_x_cat": "X 변수(범주형)를 선택",
-        "select_y_cat": "Y 변수(범주형)를 선택",
-        "not_enough_categorical": "카이제곱 검정에 필요한 범주형 열이 부족합니다.",
-        "chi_square_result": "카이제곱 검정 결과",
-        "chi_square_stat": "카이제곱 통계량",
-        "chi_square_df": "자유도 (df)",
-        "chi_square_p": "p-값",
-        "alpha_note": "유의수준 α = 0.05에서 검정합니다.",
-        "significant_assoc": "두 변수 사이에 통계적으로 유의한 관계가 있습니다.",
-        "no_significant_assoc": "두 변수 사이에 통계적으로 유의한 관계가 없습니다.",
-        "corr_direction_positive": "양의 관계: X가 증가하면 Y도 증가하는 경향이 있습니다.",
-        "corr_direction_negative": "음의 관계: X가 증가하면 Y는 감소하는 경향이 있습니다.",
-        "corr_direction_zero": "명확한 관계 방향이 없습니다(거의 0).",
-        "corr_strength_none": "거의 관계가 없습니다.",
-        "corr_strength_weak": "약한 관계입니다.",
-        "corr_strength_moderate": "보통 정도의 관계입니다.",
-        "corr_strength_strong": "강한 관계입니다.",
-        "warning_select_valid": "올바른 열 조합을 선택하세요.",
-        "header_github": "GitHub에서 포크",
-        "nav_desc": "기술통계",
-        "nav_visual": "시각화",
-        "nav_corr": "상관 및 검정",
-        "nav_text": "텍스트 처리",
-        "export_title": "보고서 내보내기",
-        "export_desc": "기술통계, 정규성 검정, 히스토그램, 박스플롯, 상관분석, 텍스트 분석 요약을 포함한 전체 PDF 보고서를 생성합니다.",
-        "export_button": "PDF 보고서 생성",
-        "export_filename": "survey_full_report_kr.pdf",
-        "pdf_title": "설문 데이터 전체 보고서",
-        "pdf_section_numdist": "1. 수치 변수 - 분포",
-        "pdf_section_scatter": "2. 산점도 - 관계",
-        "pdf_section_catbar": "3. 범주형 변수 - 막대 그래프",
-        "pdf_section_numfull": "4. 수치 변수 - 상세 통계",
-        "pdf_section_catfreq": "5. 범주형 변수 - 도수표",
-        "pdf_section_corr": "6. 상관 분석",
-        "pdf_section_text": "7. 텍스트 분석 - 상위 단어",
-        "pdf_notext": "분석할 텍스트 데이터가 없습니다.",
-    },
-    "CN": {  # Chinese (Simplified)
-        "title": "📊 问卷数据分析",
-        "subtitle": "上传问卷文件（CSV/Excel），交互式地查看描述性统计、可视化和相关性检验。",
-        "upload_subheader": "📁 上传问卷数据",
-        "upload_label": "将文件拖放到此处或点击选择（CSV, XLS, XLSX）",
-        "data_preview": "数据预览（前 1000 行）",
-        "text_processing_subheader": "📝 文本预处理",
-        "text_columns_detected": "检测到的文本列：",
-        "select_text_col": "选择要处理的文本列",
-        "no_text_columns": "未找到文本类型的列。",
-        "text_processing_note": "文本将被转为小写，去除标点符号，以空格分词，并移除英文停用词。",
-        "sample_tokens": "预处理后的词元示例",
-        "top_words": "词频最高的 10 个词",
-        "stats_subheader": "📈 描述性统计与分布",
-        "select_numeric_col": "选择用于统计/绘图的数值列",
-        "no_numeric_cols": "没有可用的数值列。",
-        "desc_stats": "所选列的描述性统计",
-        "freq_table_subheader": "📊 分类频数表",
-        "select_categorical_col": "选择用于频数表的分类列",
-        "no_categorical_cols": "没有分类列。",
-        "freq_count": "频数",
-        "freq_percent": "百分比（%）",
-        "visual_subheader": "📉 数据可视化",
-        "histogram": "直方图",
-        "boxplot": "箱线图",
-        "correlation_subheader": "🔗 相关性与统计检验",
-        "pearson_header": "皮尔逊相关",
-        "spearman_header": "斯皮尔曼等级相关",
-        "chi_header": "卡方检验",
-        "select_x_numeric": "选择 X 变量（数值）",
-        "select_y_numeric": "选择 Y 变量（数值）",
-        "not_enough_numeric": "可用于该分析的数值列不足。",
-        "pearson_result": "皮尔逊相关结果",
-        "spearman_result": "斯皮尔曼相关结果",
-        "corr_coef": "相关系数 (r)",
-        "p_value": "p 值",
-        "interpretation": "解释",
-        "select_x_cat": "选择 X 变量（分类）",
-        "select_y_cat": "选择 Y 变量（分类）",
-        "not_enough_categorical": "用于卡方检验的分类列不足。",
-        "chi_square_result": "卡方检验结果",
-        "chi_square_stat": "卡方统计量",
-        "chi_square_df": "自由度 (df)",
-        "chi_square_p": "p 值",
-        "alpha_note": "在显著性水平 α = 0.05 下进行检验。",
-        "significant_assoc": "两个变量之间存在统计上显著的关联。",
-        "no_significant_assoc": "两个变量之间不存在统计上显著的关联。",
-        "corr_direction_positive": "正相关：X 增加时，Y 通常也增加。",
-        "corr_direction_negative": "负相关：X 增加时，Y 通常减少。",
-        "corr_direction_zero": "没有明显的相关方向（接近 0）。",
-        "corr_strength_none": "几乎没有相关关系。",
-        "corr_strength_weak": "相关关系较弱。",
-        "corr_strength_moderate": "相关关系中等。",
-        "corr_strength_strong": "相关关系较强。",
-        "warning_select_valid": "请选择有效的列组合。",
-        "header_github": "在 GitHub 上 Fork",
-        "nav_desc": "描述性统计",
-        "nav_visual": "可视化",
-        "nav_corr": "相关与检验",
-        "nav_text": "文本处理",
-        "export_title": "导出报告",
-        "export_desc": "生成包含描述性统计、正态性检验、直方图、箱线图、相关分析和文本分析摘要的完整 PDF 报告。",
-        "export_button": "生成 PDF 报告",
-        "export_filename": "survey_full_report_cn.pdf",
-        "pdf_title": "问卷数据完整报告",
-        "pdf_section_numdist": "1. 数值变量 - 分布",
-        "pdf_section_scatter": "2. 散点图 - 关系",
-        "pdf_section_catbar": "3. 类别变量 - 条形图",
-        "pdf_section_numfull": "4. 数值变量 - 详细统计",
-        "pdf_section_catfreq": "5. 类别变量 - 频数表",
-        "pdf_section_corr": "6. 相关分析",
-        "pdf_section_text": "7. 文本分析 - 高频词",
-        "pdf_notext": "没有可供分析的文本数据。",
-    },
-    "AR": {  # Arabic
-        "title": "📊 تحليل بيانات الاستبيان",
-        "subtitle": "قم برفع ملف الاستبيان (CSV/Excel) لاستكشاف الإحصاءات الوصفية والرسوم البيانية واختبارات الارتباط بطريقة تفاعلية.",
-        "upload_subheader": "📁 رفع بيانات الاستبيان",
-        "upload_label": "اسحب وأفلت الملف هنا أو اضغط للاختيار (CSV, XLS, XLSX)",
-        "data_preview": "معاينة البيانات (حتى أول 1000 صف)",
-        "text_processing_subheader": "📝 معالجة النصوص",
-        "text_columns_detected": "الأعمدة النصية المكتشفة:",
-        "select_text_col": "اختر عمود النص للمعالجة",
-        "no_text_columns": "لا توجد أعمدة من نوع نصي.",
-        "text_processing_note": "سيتم تحويل النص إلى حروف صغيرة، وإزالة علامات الترقيم، وتقسيمه إلى كلمات، وحذف كلمات الوقف الإنجليزية.",
-        "sample_tokens": "عينة من الرموز المعالجة",
-        "top_words": "أكثر 10 كلمات تكراراً",
-        "stats_subheader": "📈 الإحصاءات الوصفية والتوزيع",
-        "select_numeric_col": "اختر عموداً رقمياً للإحصاءات والرسوم",
-        "no_numeric_cols": "لا توجد أعمدة رقمية متاحة.",
-        "desc_stats": "الإحصاءات الوصفية للعمود المحدد",
-        "freq_table_subheader": "📊 جدول التكرار للفئات",
-        "select_categorical_col": "اختر عموداً فئوياً لجدول التكرار",
-        "no_categorical_cols": "لا توجد أعمدة فئوية.",
-        "freq_count": "العدد",
-        "freq_percent": "النسبة المئوية (%)",
-        "visual_subheader": "📉 عرض البيانات بيانياً",
-        "histogram": "مخطط التوزيع (Histogram)",
-        "boxplot": "مخطط الصندوق (Boxplot)",
-        "correlation_subheader": "🔗 الارتباط والاختبارات الإحصائية",
-        "pearson_header": "معامل ارتباط بيرسون",
-        "spearman_header": "معامل ارتباط سبيرمان",
-        "chi_header": "اختبار كاي تربيع",
-        "select_x_numeric": "اختر متغير X (رقمي)",
-        "select_y_numeric": "اختر متغير Y (رقمي)",
-        "not_enough_numeric": "لا يوجد عدد كافٍ من الأعمدة الرقمية لهذا التحليل.",
-        "pearson_result": "نتيجة ارتباط بيرسون",
-        "spearman_result": "نتيجة ارتباط سبيرمان",
-        "corr_coef": "معامل الارتباط (r)",
-        "p_value": "قيمة p",
-        "interpretation": "التفسير",
-        "select_x_cat": "اختر متغير X (فئوي)",
-        "select_y_cat": "اختر متغير Y (فئوي)",
-        "not_enough_categorical": "لا يوجد عدد كافٍ من الأعمدة الفئوية لاختبار كاي تربيع.",
-        "chi_square_result": "نتيجة اختبار كاي تربيع",
-        "chi_square_stat": "إحصائية كاي تربيع",
-        "chi_square_df": "درجات الحرية (df)",
-        "chi_square_p": "قيمة p",
-        "alpha_note": "تم الاختبار عند مستوى دلالة α = 0.05.",
-        "significant_assoc": "هناك علاقة ذات دلالة إحصائية بين المتغيرين.",
-        "no_significant_assoc": "لا توجد علاقة ذات دلالة إحصائية بين المتغيرين.",
-        "corr_direction_positive": "علاقة طردية: عند زيادة X يميل Y إلى الزيادة.",
-        "corr_direction_negative": "علاقة عكسية: عند زيادة X يميل Y إلى النقصان.",
-        "corr_direction_zero": "لا يوجد اتجاه واضح للعلاقة (قيمة الارتباط قريبة من الصفر).",
-        "corr_strength_none": "لا توجد علاقة تقريباً.",
-        "corr_strength_weak": "علاقة ضعيفة.",
-        "corr_strength_moderate": "علاقة متوسطة.",
-        "corr_strength_strong": "علاقة قوية.",
-        "warning_select_valid": "يرجى اختيار مجموعة أعمدة صحيحة.",
-        "header_github": "Fork على GitHub",
-        "nav_desc": "إحصاءات وصفية",
-        "nav_visual": "الرسوم البيانية",
-        "nav_corr": "الارتباط والاختبارات",
-        "nav_text": "معالجة النصوص",
-        "export_title": "تصدير التقرير",
-        "export_desc": "إنشاء تقرير PDF كامل يحتوي على الإحصاءات الوصفية، واختبار التوزيع الطبيعي، والرسوم البيانية، والارتباطات، وملخص تحليل النصوص.",
-        "export_button": "إنشاء تقرير PDF",
-        "export_filename": "survey_full_report_ar.pdf",
-        "pdf_title": "تقرير كامل لبيانات الاستبيان",
-        "pdf_section_numdist": "١. المتغيرات العددية - التوزيع",
-        "pdf_section_scatter": "٢. مخططات الانتشار - العلاقات",
-        "pdf_section_catbar": "٣. المتغيرات الفئوية - المخططات الشريطية",
-        "pdf_section_numfull": "٤. المتغيرات العددية - الإحصاءات الكاملة",
-        "pdf_section_catfreq": "٥. المتغيرات الفئوية - جداول التكرار",
-        "pdf_section_corr": "٦. تحليل الارتباط",
-        "pdf_section_text": "٧. تحليل النص - أهم الكلمات",
-        "pdf_notext": "لا توجد بيانات نصية للتحليل.",
-    },
-}
+TEXT = text_table(st.session_state.get("language", "EN"), source="analisis_survei")
 
 def get_text(key: str) -> str:
-    lang = st.session_state.get("language", "EN")
-    lang_dict = TEXTS.get(lang, TEXTS.get("EN", {}))
-    return lang_dict.get(key, key)
+    return TEXT[key]
 
 # --------------------------- HELPER FUNCTIONS ---------------------------
 def load_data(uploaded_file):
-    if uploaded_file is None:
-        return None
-    name = uploaded_file.name.lower()
-    try:
-        if name.endswith(".csv"):
-            return pd.read_csv(uploaded_file)
-        if name.endswith(".xls") or name.endswith(".xlsx"):
-            return pd.read_excel(uploaded_file)
-    except Exception:
-        return None
-    return None
-
-def preprocess_text_series(series: pd.Series) -> pd.Series:
-    eng_stop = set(stopwords.words("english"))
-    punct_table = str.maketrans("", "", string.punctuation)
-
-    def _clean(text):
-        if pd.isna(text):
-            return []
-        text = str(text).lower()
-        text = text.translate(punct_table)
-        tokens = text.split()
-        tokens = [t for t in tokens if t.isalpha() and t not in eng_stop]
-        return tokens
-
-    return series.apply(_clean)
+    return load_survey(uploaded_file)
 
 def descriptive_stats(series: pd.Series) -> pd.DataFrame:
     s = pd.to_numeric(series, errors="coerce")
@@ -1135,7 +658,7 @@ if filter_cols:
         unique_vals = df[fcol].dropna().unique().tolist()
         selected_vals = st.multiselect("Select values", options=unique_vals, default=unique_vals)
         if selected_vals:
-            filtered_df = df[df[fcol].isin(selected_vals)]
+            filtered_df = filter_rows(df, df[fcol].isin(selected_vals))
 
 st.markdown(f"#### {get_text('data_preview')}")
 df_preview = filtered_df.head(1000)
@@ -1156,7 +679,7 @@ st.markdown(
 
 numeric_cols = filtered_df.select_dtypes(include=[np.number]).columns.tolist()
 cat_cols = filtered_df.select_dtypes(exclude=[np.number]).columns.tolist()
-text_cols = filtered_df.select_dtypes(include=["object", "string"]).columns.tolist()
+text_cols = filtered_df.select_dtypes(include=["object", "string", "category"]).columns.tolist()
 
 # --------------------------- TABS ---------------------------
 tab_desc, tab_vis, tab_corr, tab_text = st.tabs(
@@ -1387,13 +910,10 @@ with tab_corr:
                     )
 
     with tab3:
-        chi_df = filtered_df.copy()
         chi_cat_candidates = [
-            c for c in chi_df.columns
+            c for c in filtered_df.columns
             if c.startswith("X") or c.startswith("Y") or c == "Responden"
         ]
-        for c in chi_cat_candidates:
-            chi_df[c] = chi_df[c].astype(str)
         cat_cols_chi = chi_cat_candidates
         if len(cat_cols_chi) < 2:
             st.info(get_text("not_enough_categorical"))
@@ -1412,7 +932,8 @@ with tab_corr:
                     key="chi_y",
                 )
             if x_cat and y_cat:
-                table = pd.crosstab(chi_df[x_cat], chi_df[y_cat])
+                # hanya dua kolom terpilih yang di-cast, bukan salinan seluruh frame
+                table = pd.crosstab(filtered_df[x_cat].astype(str), filtered_df[y_cat].astype(str))
                 if table.size == 0:
                     st.warning(get_text("warning_select_valid"))
                 else:
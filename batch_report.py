@@ -0,0 +1,190 @@
+"""Headless batch export of survey PDF reports.
+
+Examples:
+    python batch_report.py survei.csv --split-by Region --lang ID
+    python batch_report.py survei.csv --filter "Region=Jakarta,Bandung" --filter "1. Gender=Female"
+
+Each --filter produces one report; conditions inside one spec are joined
+with ";" (e.g. "Region=Jakarta;1. Gender=Female"). --split-by produces one
+report per distinct value of a column. Without either, a single report is
+built for the whole file.
+"""
+import argparse
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import numpy as np
+
+from i18n import languages
+from survey_io import filter_rows, frame_fingerprint, load_survey_file
+from survey_report import CHART_MODES, REPORT_CHARTS, build_survey_report_pdf
+
+_WORKER_DF = None
+_WORKER_LANG = "EN"
+_WORKER_CHART_WORKERS = 1
+_WORKER_CHARTS = None
+
+
+# --------------------------- FILTER SPECS ---------------------------
+def parse_filter_spec(spec: str):
+    """'Region=Jakarta,Bandung;1. Gender=Female' -> [(col, [values]), ...]"""
+    conditions = []
+    for part in spec.split(";"):
+        if not part.strip():
+            continue
+        if "=" not in part:
+            raise ValueError(f"Invalid filter (expected COLUMN=VALUE[,VALUE...]): {part!r}")
+        col, values = part.split("=", 1)
+        conditions.append((col.strip(), [v.strip() for v in values.split(",")]))
+    return conditions
+
+
+def apply_filters(df, conditions):
+    mask = np.ones(len(df), dtype=bool)
+    for col, values in conditions:
+        if col not in df.columns:
+            raise KeyError(f"Unknown filter column: {col!r}")
+        mask &= df[col].astype(str).isin(values).to_numpy()
+    return filter_rows(df, mask)
+
+
+def classify_columns(df):
+    numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
+    cat_cols = df.select_dtypes(exclude=[np.number]).columns.tolist()
+    text_cols = df.select_dtypes(include=["object", "string", "category"]).columns.tolist()
+    return numeric_cols, cat_cols, text_cols
+
+
+def slugify(text: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", text).strip("_") or "report"
+
+
+def build_jobs(df, filters, split_by, out_dir):
+    jobs = []
+    for spec in filters:
+        jobs.append((spec, parse_filter_spec(spec)))
+    if split_by:
+        if split_by not in df.columns:
+            raise KeyError(f"Unknown --split-by column: {split_by!r}")
+        for value in sorted(df[split_by].dropna().astype(str).unique()):
+            jobs.append((f"{split_by}={value}", [(split_by, [value])]))
+    if not jobs:
+        jobs.append(("all", []))
+    return [
+        (name, conditions, os.path.join(out_dir, f"{i:03d}_{slugify(name)}.pdf"))
+        for i, (name, conditions) in enumerate(jobs, 1)
+    ]
+
+
+# --------------------------- WORKERS ---------------------------
+def _init_worker(input_path: str, lang: str, chart_workers: int = 1, charts: str = None):
+    global _WORKER_DF, _WORKER_LANG, _WORKER_CHART_WORKERS, _WORKER_CHARTS
+    _WORKER_DF = load_survey_file(input_path)
+    _WORKER_LANG = lang
+    _WORKER_CHART_WORKERS = chart_workers
+    _WORKER_CHARTS = charts
+
+
+def _render_job(job):
+    name, conditions, out_path = job
+    start = time.perf_counter()
+    sub = apply_filters(_WORKER_DF, conditions)
+    if sub.empty:
+        return name, out_path, 0, time.perf_counter() - start, None
+    numeric_cols, cat_cols, text_cols = classify_columns(sub)
+    data_key = (frame_fingerprint(sub), tuple((col, tuple(values)) for col, values in conditions))
+    # langsung ke file tujuan, tanpa buffer di memori
+    with open(out_path, "wb") as f:
+        build_survey_report_pdf(
+            sub,
+            numeric_cols,
+            cat_cols,
+            text_cols,
+            lang=_WORKER_LANG,
+            chart_workers=_WORKER_CHART_WORKERS,
+            data_key=data_key,
+            output=f,
+            charts=_WORKER_CHARTS,
+        )
+    return name, out_path, len(sub), time.perf_counter() - start, os.path.getsize(out_path)
+
+
+# --------------------------- CLI ---------------------------
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Render survey PDF reports without the Streamlit UI.")
+    parser.add_argument("input", help="Survey file (CSV, XLS, XLSX)")
+    parser.add_argument(
+        "--filter",
+        action="append",
+        default=[],
+        metavar="SPEC",
+        help='One report per spec, e.g. "Region=Jakarta,Bandung;1. Gender=Female"',
+    )
+    parser.add_argument("--split-by", metavar="COLUMN", help="One report per distinct value of COLUMN")
+    parser.add_argument("--lang", default="EN", choices=sorted(languages()), help="Report language")
+    parser.add_argument("--out-dir", default="reports", help="Output directory (default: reports)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument(
+        "--chart-workers",
+        type=int,
+        default=1,
+        help="Chart rendering processes per report (default: 1, reports already run in parallel)",
+    )
+    parser.add_argument(
+        "--charts",
+        choices=CHART_MODES,
+        default=REPORT_CHARTS,
+        help=f"Chart output: vector drawings or PNG images (default: {REPORT_CHARTS})",
+    )
+    args = parser.parse_args(argv)
+
+    df = load_survey_file(args.input)
+    if df is None:
+        print(f"Cannot read survey file: {args.input}", file=sys.stderr)
+        return 1
+    try:
+        jobs = build_jobs(df, args.filter, args.split_by, args.out_dir)
+    except (KeyError, ValueError) as exc:
+        print(exc, file=sys.stderr)
+        return 2
+    os.makedirs(args.out_dir, exist_ok=True)
+
+    workers = max(1, min(args.workers, len(jobs)))
+    print(f"Rendering {len(jobs)} report(s) from {len(df)} rows with {workers} worker(s)...")
+    start = time.perf_counter()
+    done = failed = 0
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(args.input, args.lang, args.chart_workers, args.charts),
+    ) as pool:
+        futures = {pool.submit(_render_job, job): job for job in jobs}
+        for future in as_completed(futures):
+            name = futures[future][0]
+            try:
+                name, out_path, n_rows, seconds, size = future.result()
+            except Exception as exc:
+                failed += 1
+                print(f"  FAILED {name}: {exc}", file=sys.stderr)
+                continue
+            if size is None:
+                print(f"  skipped {name}: no rows match")
+                continue
+            done += 1
+            print(f"  {name}: {n_rows} rows -> {out_path} ({size / 1024:.0f} KB, {seconds:.1f}s)")
+
+    elapsed = time.perf_counter() - start
+    rate = done / elapsed * 60 if elapsed > 0 else 0.0
+    print(f"Done: {done} report(s), {failed} failed in {elapsed:.1f}s ({rate:.1f} reports/minute)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
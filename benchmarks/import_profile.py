@@ -0,0 +1,68 @@
+"""Import-time profile of the dashboard's first paint (upload card, no file).
+
+Usage:
+    python benchmarks/import_profile.py [--top 15] [--script group5.py]
+
+Runs the app once through streamlit's AppTest in a child interpreter started
+with ``python -X importtime`` and prints the slowest top-level imports, the
+wall time of the run and which heavy libraries were loaded. Plotting,
+scipy.stats, reportlab and nltk should all show "no" until a chart, a test,
+the PDF export or the text tab needs them.
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ["matplotlib.pyplot", "seaborn", "scipy.stats", "reportlab.platypus", "nltk"]
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+
+def _child(script: str):
+    # app modules resolve relative to the repo root, as under `streamlit run`
+    sys.path.insert(0, ROOT)
+    os.chdir(ROOT)
+    from streamlit.testing.v1 import AppTest
+
+    start = time.perf_counter()
+    at = AppTest.from_file(os.path.join(ROOT, script), default_timeout=120).run()
+    elapsed = time.perf_counter() - start
+    print(f"first paint: {elapsed:.2f}s, exceptions: {len(at.exception)}")
+    for name in HEAVY_MODULES:
+        print(f"  {name:<20} loaded: {'yes' if name in sys.modules else 'no'}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--top", type=int, default=15, help="Number of top-level imports to list")
+    parser.add_argument("--script", default="group5.py", help="App script, relative to the repo root")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.child:
+        _child(args.script)
+        return 0
+
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", os.path.abspath(__file__), "--child", "--script", args.script],
+        capture_output=True,
+        text=True,
+    )
+    # only top-level packages; nested lines are already part of their cumulative time
+    top_level = []
+    for line in proc.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match and not match.group(3):
+            top_level.append((int(match.group(2)), match.group(4)))
+    total = sum(us for us, _ in top_level)
+    print(f"{args.script}: {total / 1e6:.2f}s importing {len(top_level)} top-level modules")
+    for us, name in sorted(top_level, reverse=True)[: args.top]:
+        print(f"  {us / 1e6:7.3f}s  {name}")
+    print(proc.stdout, end="")
+    return proc.returncode
+
+
+if __name__ == "__main__":
+    sys.exit(main())
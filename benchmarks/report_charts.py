@@ -0,0 +1,55 @@
+"""PDF report with vector charts vs PNG charts: build time and file size.
+
+Usage:
+    python benchmarks/report_charts.py SURVEY_FILE [--lang EN] [--repeat 3]
+
+Builds the full report from SURVEY_FILE once per chart mode without any
+caching (data_key=None, so every chart is drawn or rendered again) and prints
+the best build time, the PDF size and the number of pages for each mode.
+"""
+import argparse
+import os
+import re
+import sys
+import time
+from io import BytesIO
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from batch_report import classify_columns  # noqa: E402
+from survey_io import load_survey_file  # noqa: E402
+from survey_report import CHART_MODES, build_survey_report_pdf  # noqa: E402
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("input", help="Survey file (CSV, XLS, XLSX)")
+    parser.add_argument("--lang", default="EN", help="Report language")
+    parser.add_argument("--repeat", type=int, default=3, help="Builds per mode; the fastest is reported")
+    args = parser.parse_args(argv)
+
+    df = load_survey_file(args.input)
+    if df is None:
+        print(f"Cannot read survey file: {args.input}", file=sys.stderr)
+        return 1
+    numeric_cols, cat_cols, text_cols = classify_columns(df)
+    print(f"{args.input}: {len(df)} rows, {len(numeric_cols)} numeric, {len(cat_cols)} categorical")
+
+    for charts in CHART_MODES:
+        best, data = None, b""
+        for _ in range(max(1, args.repeat)):
+            start = time.perf_counter()
+            buffer = build_survey_report_pdf(
+                df, numeric_cols, cat_cols, text_cols, lang=args.lang, chart_workers=1, output=BytesIO(), charts=charts
+            )
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+            data = buffer.getvalue()
+        pages = len(re.findall(rb"/Type /Page\b", data))
+        print(f"  {charts:<7} {best:6.2f}s  {len(data) / 1024:8.0f} KB  {pages} pages")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,43 @@
+import functools
+import json
+import os
+
+# --------------------------- MULTI-LANGUAGE TEXTS ---------------------------
+# Translations live in data/i18n/<source>.json ({lang: {key: text}}) and are
+# parsed once per process. Every language is compiled into one flat table
+# with the English texts merged underneath, so a lookup is a single dict
+# access and unknown languages or keys never need a second fallback step.
+I18N_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "i18n")
+FALLBACK_LANGUAGE = "EN"
+
+
+class TextTable(dict):
+    """Flat key -> text table of one language; a missing key returns the key itself."""
+
+    def __missing__(self, key):
+        return key
+
+
+@functools.lru_cache(maxsize=None)
+def load_texts(source: str = "app") -> dict:
+    """All languages of data/i18n/<source>.json, read once per process."""
+    with open(os.path.join(I18N_DIR, f"{source}.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def languages(source: str = "app") -> list:
+    return list(load_texts(source))
+
+
+@functools.lru_cache(maxsize=None)
+def text_table(lang: str, source: str = "app") -> TextTable:
+    """Compiled table for lang (English when lang is unknown). Shared: do not mutate."""
+    texts = load_texts(source)
+    table = TextTable(texts.get(FALLBACK_LANGUAGE, {}))
+    table.update(texts.get(lang, {}))
+    return table
+
+
+def translate(lang: str, key: str) -> str:
+    """Retrieve the text for key in lang (English table when lang is unknown)."""
+    return text_table(lang)[key]
@@ -0,0 +1,284 @@
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+# --------------------------- SIZE ESTIMATION ---------------------------
+def estimate_nbytes(value) -> int:
+    """Approximate in-memory size of a cached value in bytes."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return len(value)
+    if isinstance(value, (tuple, list)):
+        return sys.getsizeof(value) + sum(estimate_nbytes(v) for v in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_nbytes(v) for v in value.values())
+    return sys.getsizeof(value)
+
+
+# --------------------------- LRU CACHE ---------------------------
+CACHES = {}
+
+
+class LRUCache:
+    """Thread-safe LRU cache bounded by a byte budget (and optionally an entry count).
+
+    Instances live at module level, so they are shared by every Streamlit
+    session served by the same process. Named instances are listed in CACHES
+    for the memory diagnostics and the global budget.
+    """
+
+    def __init__(self, max_bytes: int, max_entries: int = None, sizeof=estimate_nbytes, name: str = None):
+        self.name = name
+        if name is not None:
+            CACHES[name] = self
+        self.max_bytes = int(max_bytes)
+        self.max_entries = max_entries
+        self._sizeof = sizeof
+        self._data = OrderedDict()
+        self._sizes = {}
+        self._lock = threading.RLock()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __contains__(self, key) -> bool:
+        with self._lock:
+            return key in self._data
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._data:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return self._data[key]
+
+    def put(self, key, value):
+        size = self._sizeof(value)
+        with self._lock:
+            if key in self._data:
+                self.total_bytes -= self._sizes.pop(key)
+                del self._data[key]
+            if size > self.max_bytes:
+                # Larger than the whole budget: serve it, but do not keep it.
+                return value
+            self._data[key] = value
+            self._sizes[key] = size
+            self.total_bytes += size
+            self._evict()
+        return value
+
+    def get_or_compute(self, key, compute):
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is sentinel:
+            value = self.put(key, compute())
+        return value
+
+    def pop(self, key, default=None):
+        with self._lock:
+            if key not in self._data:
+                return default
+            self.total_bytes -= self._sizes.pop(key)
+            return self._data.pop(key)
+
+    def bytes_where(self, predicate) -> int:
+        """Total size of the entries whose key satisfies predicate."""
+        with self._lock:
+            return sum(size for key, size in self._sizes.items() if predicate(key))
+
+    def pop_where(self, predicate) -> int:
+        """Drop every entry whose key satisfies predicate; returns the bytes freed."""
+        with self._lock:
+            keys = [key for key in self._data if predicate(key)]
+            freed = 0
+            for key in keys:
+                freed += self._sizes.pop(key)
+                del self._data[key]
+            self.total_bytes -= freed
+            return freed
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._sizes.clear()
+            self.total_bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._data),
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def _evict(self):
+        while self._data and (
+            self.total_bytes > self.max_bytes
+            or (self.max_entries is not None and len(self._data) > self.max_entries)
+        ):
+            old_key, _ = self._data.popitem(last=False)
+            self.total_bytes -= self._sizes.pop(old_key)
+            self.evictions += 1
+
+
+# --------------------------- ANALYSIS RESULT STORE ---------------------------
+# One budget for every analysis result (descriptive tables, correlation
+# matrices, value counts, crosstabs, filter partials). Results are keyed by
+# (dataset fingerprint, filter key) plus the operation, so the UI tabs, the
+# PDF export and the insights read the very same objects instead of
+# recomputing them. Stored results are shared: callers must not mutate them.
+ANALYSIS_STORE_MB = int(os.environ.get("SURVEY_ANALYSIS_STORE_MB", "512"))
+ANALYSIS_STORE = LRUCache(max_bytes=ANALYSIS_STORE_MB * 1024 * 1024, max_entries=4096, name="analysis")
+
+
+def analysis_result(data_key, operation: tuple, compute):
+    """compute() once per (data_key, operation); data_key=None means uncached."""
+    if data_key is None:
+        return compute()
+    return ANALYSIS_STORE.get_or_compute((data_key, operation), compute)
+
+
+# --------------------------- SESSION FOOTPRINT ---------------------------
+# The caches are shared, but every entry is keyed by the fingerprint of the
+# dataset it was computed from, so each session's share can be attributed:
+# the entries of the dataset it has open, plus what it holds privately (the
+# upload, its finished PDF export). Sessions report themselves on
+# every rerun. When the caches and the private bytes together exceed
+# MEMORY_BUDGET_MB, the datasets that only idle sessions (no rerun for
+# SESSION_IDLE_SECONDS) still use are dropped from every cache, oldest session
+# first, and those sessions' release hooks run; an idle session that comes
+# back parses its upload again (or memory-maps its snapshot, when enabled).
+MEMORY_BUDGET_MB = int(os.environ.get("SURVEY_MEMORY_BUDGET_MB", "2048"))
+SESSION_IDLE_SECONDS = int(os.environ.get("SURVEY_SESSION_IDLE_SECONDS", "900"))
+SESSION_EXPIRE_SECONDS = 24 * 3600
+
+
+def key_mentions(key, token) -> bool:
+    """True if token occurs anywhere in a (nested tuple) cache key."""
+    if key == token:
+        return True
+    return isinstance(key, tuple) and any(key_mentions(part, token) for part in key)
+
+
+class SessionRegistry:
+    """Per-session memory accounting over the shared caches."""
+
+    def __init__(self, budget_bytes: int, idle_seconds: float):
+        self.budget_bytes = int(budget_bytes)
+        self.idle_seconds = idle_seconds
+        self._sessions = {}
+        self._lock = threading.Lock()
+        self.releases = 0
+        self.released_bytes = 0
+
+    def touch(self, session_id, dataset=None, private: dict = None, release: dict = None):
+        """Record a rerun of session_id, then apply the budget.
+
+        dataset is the fingerprint of the frame it has open, private its own
+        bytes by name, release maps some of those names to a callable that
+        frees them (e.g. spilling a buffer to disk).
+        """
+        with self._lock:
+            self._sessions[session_id] = {
+                "dataset": dataset,
+                "private": dict(private or {}),
+                "release": dict(release or {}),
+                "last_seen": time.monotonic(),
+                "released": False,
+            }
+        return self.enforce_budget()
+
+    def forget(self, session_id):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            private = sum(sum(rec["private"].values()) for rec in self._sessions.values())
+        return private + sum(cache.total_bytes for cache in CACHES.values())
+
+    def footprint(self, session_id) -> dict:
+        """Private bytes by name and, per cache, the bytes of this session's dataset."""
+        with self._lock:
+            rec = self._sessions.get(session_id)
+            if rec is None:
+                return {"private": {}, "shared": {}, "sharing_sessions": 0}
+            dataset = rec["dataset"]
+            private = dict(rec["private"])
+            sharing = sum(1 for other in self._sessions.values() if dataset is not None and other["dataset"] == dataset)
+        shared = {}
+        if dataset is not None:
+            shared = {name: cache.bytes_where(lambda key: key_mentions(key, dataset)) for name, cache in CACHES.items()}
+        return {"private": private, "shared": shared, "sharing_sessions": sharing}
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        with self._lock:
+            idle = sum(1 for rec in self._sessions.values() if now - rec["last_seen"] > self.idle_seconds)
+            sessions = len(self._sessions)
+        return {
+            "sessions": sessions,
+            "idle_sessions": idle,
+            "total_bytes": self.total_bytes(),
+            "budget_bytes": self.budget_bytes,
+            "releases": self.releases,
+            "released_bytes": self.released_bytes,
+        }
+
+    def enforce_budget(self) -> int:
+        """Release idle sessions' datasets until under budget; returns the bytes freed."""
+        if self.total_bytes() <= self.budget_bytes:
+            return 0
+        now = time.monotonic()
+        with self._lock:
+            for session_id in [
+                sid for sid, rec in self._sessions.items() if now - rec["last_seen"] > SESSION_EXPIRE_SECONDS
+            ]:
+                del self._sessions[session_id]
+            active = {rec["dataset"] for rec in self._sessions.values() if now - rec["last_seen"] <= self.idle_seconds}
+            idle = sorted(
+                (rec for rec in self._sessions.values() if now - rec["last_seen"] > self.idle_seconds and not rec["released"]),
+                key=lambda rec: rec["last_seen"],
+            )
+        freed = 0
+        for rec in idle:
+            dataset = rec["dataset"]
+            if dataset is not None and dataset not in active:
+                freed += sum(cache.pop_where(lambda key: key_mentions(key, dataset)) for cache in CACHES.values())
+            for name, release in rec["release"].items():
+                try:
+                    release()
+                except Exception:
+                    continue
+                freed += rec["private"].pop(name, 0)
+            rec["release"] = {}
+            rec["released"] = True
+            self.releases += 1
+            if self.total_bytes() <= self.budget_bytes:
+                break
+        self.released_bytes += freed
+        return freed
+
+
+SESSIONS = SessionRegistry(MEMORY_BUDGET_MB * 1024 * 1024, SESSION_IDLE_SECONDS)
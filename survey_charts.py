@@ -0,0 +1,287 @@
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import CancelledError, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+
+import numpy as np
+
+from survey_cache import LRUCache
+from survey_lazy import mpl_agg, mpl_figure, plt
+
+# --------------------------- FIGURE CACHE ---------------------------
+# Rendered charts are kept as encoded image bytes keyed by everything that
+# changes the picture (data, column, theme, language), so switching back
+# to a chart that was already drawn costs no matplotlib work at all.
+FIGURE_CACHE = LRUCache(max_bytes=128 * 1024 * 1024, max_entries=512, name="figures")
+
+# st.pyplot defaults, so cached images look the same as before
+DISPLAY_DPI = 200
+
+
+def figure_bytes(fig, fmt: str = "png", dpi: int = DISPLAY_DPI) -> bytes:
+    """Encode a figure and always close it so it cannot leak across reruns."""
+    try:
+        buffer = BytesIO()
+        fig.savefig(buffer, format=fmt, dpi=dpi, bbox_inches="tight")
+        return buffer.getvalue()
+    finally:
+        plt.close(fig)
+
+
+def cached_figure(key, draw, fmt: str = "png", dpi: int = DISPLAY_DPI) -> bytes:
+    """Image bytes for draw() (a callable returning a Figure), rendered once per key.
+
+    key=None disables caching (e.g. when the data has no stable identity).
+    """
+    if key is None:
+        return figure_bytes(draw(), fmt=fmt, dpi=dpi)
+    return FIGURE_CACHE.get_or_compute((key, fmt, dpi), lambda: figure_bytes(draw(), fmt=fmt, dpi=dpi))
+
+
+# --------------------------- HISTOGRAMS ---------------------------
+def draw_histogram(ax, hist, color: str, kde_color: str = None, **bar_kw):
+    """Bars and KDE line of a survey_stats.Histogram; no binning happens here."""
+    ax.stairs(hist.counts, hist.edges, fill=True, color=color, **bar_kw)
+    if hist.kde_x is not None:
+        ax.plot(hist.kde_x, hist.kde_y, color=kde_color or color, linewidth=1.5)
+
+
+# --------------------------- LARGE-N SCATTER ---------------------------
+# Above SCATTER_MAX_POINTS pairs a scatter is drawn as a 2-D histogram
+# (density per grid cell) instead of one marker per row: the picture stays
+# readable and the figure holds a grid, not half a million points. The trend
+# line comes from the sufficient statistics (n, sums, sums of squares and
+# cross-products), never from a fit over the point set.
+SCATTER_MAX_POINTS = int(os.environ.get("SURVEY_SCATTER_MAX_POINTS", "20000"))
+SCATTER_GRID = 80
+
+
+def trend_line(x: np.ndarray, y: np.ndarray):
+    """(slope, intercept) of the least-squares line, or None when x is constant."""
+    n = len(x)
+    if n < 2:
+        return None
+    # shift by the first pair so the sums stay well conditioned
+    x0, y0 = x[0], y[0]
+    a, b = x - x0, y - y0
+    sa, sb = a.sum(), b.sum()
+    saa, sab = a @ a, a @ b
+    denom = n * saa - sa * sa
+    if not denom > 0:
+        return None
+    slope = (n * sab - sa * sb) / denom
+    intercept = (y0 + sb / n) - slope * (x0 + sa / n)
+    return float(slope), float(intercept)
+
+
+def scatter_payload(x, y, max_points: int = None, bins: int = SCATTER_GRID) -> dict:
+    """What draw_scatter/draw_trend need for paired numeric arrays without NaNs."""
+    if max_points is None:
+        max_points = SCATTER_MAX_POINTS
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    payload = {"n": len(x), "line": trend_line(x, y), "x_range": (x.min(), x.max()) if len(x) else None}
+    if len(x) > max_points:
+        counts, x_edges, y_edges = np.histogram2d(x, y, bins=bins)
+        payload["grid"] = (counts, x_edges, y_edges)
+    else:
+        payload["points"] = (x, y)
+    return payload
+
+
+def draw_scatter(ax, payload: dict, color: str, **scatter_kw):
+    """Markers for small N, a log-scaled density grid for large N."""
+    if "grid" in payload:
+        from matplotlib.colors import LogNorm
+
+        counts, x_edges, y_edges = payload["grid"]
+        mesh = ax.pcolormesh(
+            x_edges, y_edges, np.ma.masked_equal(counts.T, 0), cmap="Greens", norm=LogNorm(), shading="flat"
+        )
+        ax.figure.colorbar(mesh, ax=ax, label="Count")
+        ax.text(
+            0.01, 0.99, f"n = {payload['n']:,}", transform=ax.transAxes, fontsize=7, va="top", ha="left"
+        )
+    else:
+        x, y = payload["points"]
+        ax.scatter(x, y, alpha=0.6, color=color, **scatter_kw)
+
+
+def draw_trend(ax, payload: dict, fmt: str = "r--", **plot_kw):
+    if payload["line"] is None:
+        return
+    slope, intercept = payload["line"]
+    xs = np.asarray(payload["x_range"])
+    ax.plot(xs, slope * xs + intercept, fmt, **plot_kw)
+
+
+# --------------------------- REPORT CHARTS ---------------------------
+# Drawing functions take plain arrays/frames and return a Figure. They live
+# at module level so a worker process can run them from a pickled job.
+REPORT_DPI = 100
+
+
+def report_figure(nrows: int = 1, ncols: int = 1, figsize=None):
+    """Figure and axes on their own Agg canvas, without pyplot's global state.
+
+    Without a pool, report charts are drawn in the export threads, several at once.
+    """
+    fig = mpl_figure.Figure(figsize=figsize)
+    mpl_agg.FigureCanvasAgg(fig)
+    return fig, fig.subplots(nrows, ncols)
+
+
+def report_distribution(col, hist, values):
+    fig, axes = report_figure(1, 2, figsize=(6.5, 2.2))
+    draw_histogram(axes[0], hist, color="#16a34a", kde_color="#14532d", edgecolor="black", alpha=0.7)
+    axes[0].set_title(f"Histogram - {col}", fontsize=10, fontweight="bold")
+    axes[0].set_xlabel("Value")
+    axes[0].set_ylabel("Frequency")
+    axes[0].grid(alpha=0.3)
+
+    axes[1].boxplot(values, vert=True)
+    axes[1].set_title(f"Boxplot - {col}", fontsize=10, fontweight="bold")
+    axes[1].set_ylabel("Value")
+    axes[1].grid(alpha=0.3, axis="y")
+
+    fig.tight_layout()
+    return fig
+
+
+def report_scatter(x_col, y_col, payload):
+    fig, ax = report_figure(figsize=(4.5, 3))
+    draw_scatter(ax, payload, color="#10b981", s=40, edgecolors="black", linewidth=0.5)
+    draw_trend(ax, payload, "r--", alpha=0.8, linewidth=2, label="Trend")
+    ax.set_xlabel(x_col, fontsize=9)
+    ax.set_ylabel(y_col, fontsize=9)
+    ax.set_title(f"Scatter {x_col} vs {y_col}", fontsize=10, fontweight="bold")
+    ax.grid(alpha=0.3)
+    if payload["line"] is not None:
+        ax.legend()
+    fig.tight_layout()
+    return fig
+
+
+def report_bar(cat_col, freq):
+    fig, ax = report_figure(figsize=(5, 2.5))
+    freq.plot(kind="bar", ax=ax, color="#22c55e", edgecolor="black")
+    ax.set_title(f"Bar Chart - {cat_col}", fontsize=10, fontweight="bold")
+    ax.set_xlabel(cat_col)
+    ax.set_ylabel("Frequency")
+    ax.tick_params(axis="x", rotation=45)
+    ax.grid(alpha=0.3, axis="y")
+    fig.tight_layout()
+    return fig
+
+
+def report_stacked_bar(col_a, col_b, ctab_pct):
+    fig, ax = report_figure(figsize=(5.5, 2.8))
+    ctab_pct.plot(kind="bar", stacked=True, ax=ax, colormap="viridis")
+    ax.set_title(f"{col_a} vs {col_b} (%)", fontsize=10, fontweight="bold")
+    ax.set_xlabel(col_a)
+    ax.set_ylabel("Percent")
+    ax.legend(fontsize=6)
+    ax.tick_params(axis="x", rotation=45)
+    ax.grid(alpha=0.3, axis="y")
+    fig.tight_layout()
+    return fig
+
+
+# --------------------------- PARALLEL RENDERING ---------------------------
+# Worker count for report charts; 1 renders in the calling process.
+CHART_WORKERS = int(os.environ.get("SURVEY_CHART_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+_POOL = None
+_POOL_WORKERS = 0
+_POOL_LOCK = threading.Lock()
+
+
+def _init_chart_worker():
+    import matplotlib
+
+    matplotlib.use("Agg")
+
+
+def _render_chart(job):
+    draw, args, dpi = job
+    return figure_bytes(draw(*args), dpi=dpi)
+
+
+def _chart_pool(workers: int):
+    """Process pool kept alive between exports (spawn: the server is multi-threaded)."""
+    global _POOL, _POOL_WORKERS
+    with _POOL_LOCK:
+        if _POOL is None or _POOL_WORKERS != workers:
+            if _POOL is not None:
+                # another export may still be mapping on the old pool: let it drain
+                _POOL.shutdown(wait=False)
+            _POOL = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_chart_worker,
+            )
+            _POOL_WORKERS = workers
+        return _POOL
+
+
+def _reset_chart_pool():
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is not None:
+            _POOL.shutdown(wait=False, cancel_futures=True)
+            _POOL = None
+
+
+atexit.register(_reset_chart_pool)
+
+
+def render_charts(jobs, workers: int = None, dpi: int = REPORT_DPI):
+    """PNG bytes for each (draw, args) job, in the same order as jobs.
+
+    With more than one worker the jobs go to a process pool; if the pool
+    cannot be used the charts are rendered here instead.
+    """
+    if workers is None:
+        workers = CHART_WORKERS
+    jobs = [(draw, tuple(args), dpi) for draw, args in jobs]
+    workers = max(1, min(int(workers), len(jobs)))
+    if workers > 1:
+        if multiprocessing.parent_process() is not None:
+            # already inside a worker (batch export): a pool kept alive here
+            # would block this process from exiting, so use one per call
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_chart_worker,
+            ) as pool:
+                return list(pool.map(_render_chart, jobs))
+        try:
+            return list(_chart_pool(workers).map(_render_chart, jobs))
+        except (BrokenProcessPool, CancelledError, OSError):
+            _reset_chart_pool()
+    return [_render_chart(job) for job in jobs]
+
+
+def render_charts_cached(jobs, workers: int = None, dpi: int = REPORT_DPI):
+    """render_charts for (key, draw, args) jobs, reusing FIGURE_CACHE entries.
+
+    Only the jobs whose key is None or not cached yet are rendered (in one
+    batch, so they still share the pool).
+    """
+    images = [None] * len(jobs)
+    missing = []
+    for i, (key, draw, args) in enumerate(jobs):
+        if key is not None:
+            images[i] = FIGURE_CACHE.get((key, "png", dpi))
+        if images[i] is None:
+            missing.append(i)
+    rendered = render_charts([(jobs[i][1], jobs[i][2]) for i in missing], workers=workers, dpi=dpi)
+    for i, png in zip(missing, rendered):
+        key = jobs[i][0]
+        if key is not None:
+            FIGURE_CACHE.put((key, "png", dpi), png)
+        images[i] = png
+    return images
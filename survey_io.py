@@ -0,0 +1,491 @@
+import hashlib
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from survey_cache import LRUCache
+
+# --------------------------- INGESTION CACHE ---------------------------
+# Parsed uploads are shared by all sessions of the process and keyed by the
+# content hash of the file, so the same bytes are only parsed once.
+FRAME_CACHE_MB = int(os.environ.get("SURVEY_FRAME_CACHE_MB", "1024"))
+FRAME_CACHE = LRUCache(max_bytes=FRAME_CACHE_MB * 1024 * 1024, max_entries=16, name="frames")
+
+_FINGERPRINTS = LRUCache(max_bytes=1024 * 1024, max_entries=256)
+
+SUPPORTED_EXTENSIONS = (".csv", ".xls", ".xlsx")
+
+
+def file_fingerprint(uploaded_file) -> str:
+    """SHA-256 of the uploaded bytes (memoized per Streamlit upload id)."""
+    file_id = getattr(uploaded_file, "file_id", None)
+    if file_id is not None:
+        digest = _FINGERPRINTS.get(file_id)
+        if digest is not None:
+            return digest
+    if hasattr(uploaded_file, "getbuffer"):
+        data = uploaded_file.getbuffer()
+        digest = hashlib.sha256(data).hexdigest()
+        del data
+    else:
+        # file on disk: hash in blocks instead of reading it whole
+        pos = uploaded_file.tell()
+        uploaded_file.seek(0)
+        sha = hashlib.sha256()
+        for block in iter(lambda: uploaded_file.read(1024 * 1024), b""):
+            sha.update(block)
+        uploaded_file.seek(pos)
+        digest = sha.hexdigest()
+    if file_id is not None:
+        _FINGERPRINTS.put(file_id, digest)
+    return digest
+
+
+def file_extension(name: str) -> str:
+    name = name.lower()
+    for ext in SUPPORTED_EXTENSIONS:
+        if name.endswith(ext):
+            return ext
+    return ""
+
+
+def parse_survey(source, ext: str, **read_kwargs) -> pd.DataFrame:
+    if ext == ".csv":
+        return pd.read_csv(source, **read_kwargs)
+    if ext in (".xls", ".xlsx"):
+        return pd.read_excel(source, **read_kwargs)
+    raise ValueError(f"Unsupported file type: {ext}")
+
+
+# --------------------------- CATEGORICAL ANSWERS ---------------------------
+# Closed-question answers (Gender, Education Level, Income bracket, Likert
+# labels) repeat a handful of strings over every row. Stored as Categorical
+# they cost one small integer code per row, and value_counts, isin and
+# crosstabs run on those codes instead of hashing Python strings.
+CATEGORY_MAX_RATIO = 0.5
+CATEGORY_MAX_LEVELS = int(os.environ.get("SURVEY_CATEGORY_MAX_LEVELS", "1000"))
+
+
+def is_low_cardinality(series: pd.Series, n_unique: int = None) -> bool:
+    n = series.count()
+    if n_unique is None:
+        n_unique = series.nunique(dropna=True)
+    return n > 0 and n_unique <= CATEGORY_MAX_LEVELS and n_unique <= n * CATEGORY_MAX_RATIO
+
+
+def categorize_columns(frame: pd.DataFrame):
+    """Convert low-cardinality text columns to Categorical.
+
+    Returns (frame, report) where report maps every non-numeric column to
+    {"unique", "ratio", "categorical", "bytes_before", "bytes_after"}.
+    """
+    report = {}
+    converted = {}
+    n_rows = max(len(frame), 1)
+    for col in frame.columns:
+        s = frame[col]
+        if pd.api.types.is_numeric_dtype(s) or pd.api.types.is_bool_dtype(s):
+            continue
+        bytes_before = int(s.memory_usage(index=False, deep=True))
+        if isinstance(s.dtype, pd.CategoricalDtype):
+            n_unique = len(s.cat.categories)
+            categorical = True
+        elif pd.api.types.is_object_dtype(s) or pd.api.types.is_string_dtype(s):
+            n_unique = s.nunique(dropna=True)
+            categorical = is_low_cardinality(s, n_unique)
+            if categorical:
+                s = s.astype("category")
+                converted[col] = s
+        else:
+            continue
+        report[col] = {
+            "unique": int(n_unique),
+            "ratio": float(n_unique / n_rows),
+            "categorical": bool(categorical),
+            "bytes_before": bytes_before,
+            "bytes_after": int(s.memory_usage(index=False, deep=True)),
+        }
+    if converted:
+        frame = frame.copy(deep=False)
+        for col, s in converted.items():
+            frame[col] = s
+    return frame, report
+
+
+def filter_rows(df: pd.DataFrame, mask) -> pd.DataFrame:
+    """df[mask], dropping categories that no longer occur in the selection.
+
+    value_counts and crosstabs of the result then match what they gave on
+    plain text columns (no zero-count levels). A selection that keeps every
+    row returns df itself rather than a copy of it.
+    """
+    if np.asarray(mask).all():
+        return df
+    sub = df[mask]
+    trimmed = {
+        col: sub[col].cat.remove_unused_categories()
+        for col in sub.columns
+        if isinstance(sub[col].dtype, pd.CategoricalDtype)
+    }
+    if trimmed:
+        sub = sub.copy(deep=False)
+        for col, s in trimmed.items():
+            sub[col] = s
+    return sub
+
+
+def cardinality_report(df: pd.DataFrame) -> pd.DataFrame:
+    """Ingest cardinality report of a loaded frame as a table (empty if unknown)."""
+    report = df.attrs.get("cardinality") or {}
+    table = pd.DataFrame.from_dict(report, orient="index")
+    table.index.name = "column"
+    return table
+
+
+# --------------------------- STREAMING INGESTION ---------------------------
+# Large CSV exports are read in chunks and every chunk is downcast before the
+# next one is parsed, so the default object/int64/float64 frame never exists
+# in full: repeated answers become category, small integers (Likert 1-5)
+# int8, other numerics float32 (integers only shrink as far as their range
+# allows, and values float32 cannot hold exactly stay float64).
+STREAM_THRESHOLD_MB = int(os.environ.get("SURVEY_STREAM_MB", "256"))
+STREAM_CHUNK_ROWS = int(os.environ.get("SURVEY_STREAM_CHUNK_ROWS", "200000"))
+
+
+def _source_size(source) -> int:
+    if hasattr(source, "size"):
+        return int(source.size)
+    if hasattr(source, "getbuffer"):
+        return source.getbuffer().nbytes
+    try:
+        return os.fstat(source.fileno()).st_size
+    except (AttributeError, OSError, ValueError):
+        return 0
+
+
+def _plan_column(series: pd.Series) -> str:
+    """Target dtype family for a column, decided on the first chunk."""
+    if pd.api.types.is_bool_dtype(series):
+        return "keep"
+    if pd.api.types.is_numeric_dtype(series):
+        values = series.dropna()
+        if pd.api.types.is_integer_dtype(series) or (
+            not values.empty and np.all(np.mod(values.to_numpy(), 1) == 0)
+        ):
+            return "integer"
+        return "float"
+    if is_low_cardinality(series):
+        return "category"
+    return "keep"
+
+
+def _to_float(series: pd.Series) -> pd.Series:
+    """float32 when every value survives the round trip, float64 otherwise.
+
+    float32 has a 24-bit mantissa: IDs, phone numbers or amounts above 2**24
+    would be rounded silently.
+    """
+    values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    small = values.astype(np.float32)
+    if np.array_equal(small.astype(np.float64), values, equal_nan=True):
+        return pd.Series(small, index=series.index, name=series.name)
+    return pd.Series(values, index=series.index, name=series.name)
+
+
+def _downcast_chunk(chunk: pd.DataFrame, plan: dict) -> pd.DataFrame:
+    out = {}
+    for col in chunk.columns:
+        s = chunk[col]
+        kind = plan.get(col, "keep")
+        if kind == "integer" and pd.api.types.is_numeric_dtype(s):
+            if s.isna().any() or not np.all(np.mod(s.dropna().to_numpy(), 1) == 0):
+                # Likert/ordinal with gaps: float keeps NaN and is still smaller than object
+                s = _to_float(s)
+            else:
+                s = pd.to_numeric(s, downcast="integer")
+        elif kind in ("integer", "float") and pd.api.types.is_numeric_dtype(s):
+            s = _to_float(s)
+        elif kind == "category":
+            s = s.astype("category")
+        out[col] = s
+    return pd.DataFrame(out, index=chunk.index)
+
+
+def _value_kind(series: pd.Series):
+    """Kind of values in one chunk of a column: "number", "text", or None when all blank."""
+    if not series.notna().any():
+        return None
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        return "number"
+    return "text"
+
+
+def _combine_parts(parts: list) -> pd.Series:
+    dtypes = [p.dtype for p in parts]
+    if all(isinstance(d, np.dtype) and d.kind in "iuf" for d in dtypes):
+        target = np.result_type(*dtypes)
+        return pd.concat([p.astype(target) for p in parts], ignore_index=True)
+    # a chunk where the column is blank parses as float64 NaN (and as a
+    # Categorical with float categories); it takes the type of the other chunks
+    filled = [p for p in parts if p.notna().any()] or parts[:1]
+    if all(isinstance(p.dtype, pd.CategoricalDtype) for p in filled):
+        categories = filled[0].cat.categories
+        for p in filled[1:]:
+            extra = p.cat.categories
+            categories = categories.append(extra[~extra.isin(categories)])
+        target = pd.CategoricalDtype(categories)
+    elif all(p.dtype == filled[0].dtype for p in filled) and (
+        pd.api.types.is_string_dtype(filled[0].dtype) or pd.api.types.is_object_dtype(filled[0].dtype)
+    ):
+        target = filled[0].dtype
+    else:
+        # chunks still disagree (e.g. true/false next to blanks): as read_csv would
+        target = object
+    return pd.concat([p.astype(target) for p in parts], ignore_index=True)
+
+
+def _reparse_as_text(source, start, columns: list, chunksize: int, read_kwargs: dict) -> dict:
+    """Read columns again as text, for columns that held numbers in one chunk and text in another.
+
+    read_csv on the whole file keeps such a column as strings; the numeric
+    chunks cannot be turned back into their original text (05 -> 5), so the
+    column is parsed again. Returns {column: [parts]} downcast like the first pass.
+    """
+    if hasattr(source, "seek"):
+        source.seek(start)
+    kwargs = dict(read_kwargs, usecols=columns, dtype={col: str for col in columns})
+    kwargs.pop("index_col", None)
+    plan = None
+    parts = {col: [] for col in columns}
+    for chunk in pd.read_csv(source, chunksize=chunksize, **kwargs):
+        if plan is None:
+            plan = {col: _plan_column(chunk[col]) for col in columns}
+        small = _downcast_chunk(chunk, plan)
+        for col in columns:
+            parts[col].append(small[col].reset_index(drop=True))
+    return parts
+
+
+def read_csv_streaming(source, chunksize: int = None, **read_kwargs):
+    """Chunked, downcasting read_csv.
+
+    Returns (frame, report); report has rows, chunks, peak_bytes (largest
+    frame memory held during the read: parts so far + current chunk) and
+    final_bytes. Columns that turn from numbers to text in a later chunk are
+    read again as text, so the frame matches what read_csv would give.
+    """
+    chunksize = chunksize or STREAM_CHUNK_ROWS
+    start = source.tell() if hasattr(source, "tell") else None
+    plan = None
+    columns = None
+    parts = {}
+    kinds = {}
+    held_bytes = 0
+    peak_bytes = 0
+    rows = chunks = 0
+    for chunk in pd.read_csv(source, chunksize=chunksize, **read_kwargs):
+        raw_bytes = int(chunk.memory_usage(index=False, deep=True).sum())
+        peak_bytes = max(peak_bytes, held_bytes + raw_bytes)
+        if plan is None:
+            columns = list(chunk.columns)
+            plan = {col: _plan_column(chunk[col]) for col in columns}
+            parts = {col: [] for col in columns}
+            kinds = {col: set() for col in columns}
+        for col in columns:
+            kinds[col].add(_value_kind(chunk[col]))
+        small = _downcast_chunk(chunk, plan)
+        del chunk
+        for col in columns:
+            parts[col].append(small[col].reset_index(drop=True))
+        held_bytes += int(small.memory_usage(index=False, deep=True).sum())
+        rows += len(small)
+        chunks += 1
+        del small
+    if plan is None:
+        frame = pd.DataFrame()
+    else:
+        mixed = [col for col in columns if {"number", "text"} <= kinds[col]]
+        if mixed:
+            for col in mixed:
+                parts[col] = None  # free the first-pass parts before reading again
+            parts.update(_reparse_as_text(source, start, mixed, chunksize, read_kwargs))
+        frame = pd.DataFrame({col: _combine_parts(parts.pop(col)) for col in columns})
+    final_bytes = int(frame.memory_usage(index=True, deep=True).sum())
+    report = {
+        "rows": rows,
+        "chunks": chunks,
+        "peak_bytes": max(peak_bytes, held_bytes + final_bytes),
+        "final_bytes": final_bytes,
+    }
+    return frame, report
+
+
+# --------------------------- COLUMNAR SNAPSHOTS ---------------------------
+# Opt-in (SURVEY_SNAPSHOTS=1): after the first parse a frame is written as
+# an uncompressed Arrow IPC (Feather v2) file named after its content hash;
+# later sessions, even after a restart, memory-map it instead of re-parsing
+# the CSV/Excel. Snapshots are respondent data at rest, so they are off by
+# default. When enabled they are kept at most SURVEY_SNAPSHOT_MAX_DAYS since
+# last use and SURVEY_SNAPSHOT_MAX_MB in total (least recently used removed
+# first); deleting SNAPSHOT_DIR clears them all.
+SNAPSHOT_DIR = os.environ.get(
+    "SURVEY_SNAPSHOT_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "survey_snapshots"),
+)
+SNAPSHOTS_ENABLED = os.environ.get("SURVEY_SNAPSHOTS", "0") == "1"
+SNAPSHOT_MAX_MB = int(os.environ.get("SURVEY_SNAPSHOT_MAX_MB", "4096"))
+SNAPSHOT_MAX_DAYS = float(os.environ.get("SURVEY_SNAPSHOT_MAX_DAYS", "7"))
+SNAPSHOT_VERSION = 3
+# attrs describing one parse run, not the data; never persisted
+SNAPSHOT_TRANSIENT_ATTRS = ("ingest",)
+
+
+def snapshot_path(key) -> str:
+    digest, ext, options = key
+    options_hash = hashlib.sha1(repr(options).encode("utf-8")).hexdigest()[:12]
+    name = f"{digest}-{ext.lstrip('.')}-{options_hash}-v{SNAPSHOT_VERSION}.arrow"
+    return os.path.join(SNAPSHOT_DIR, name)
+
+
+def read_snapshot(key):
+    """Load a snapshot memory-mapped, or None when there is none."""
+    if not SNAPSHOTS_ENABLED:
+        return None
+    path = snapshot_path(key)
+    if not os.path.exists(path):
+        return None
+    try:
+        import pyarrow.feather as feather
+
+        table = feather.read_table(path, memory_map=True)
+        frame = table.to_pandas(split_blocks=True)
+    except Exception:
+        return None
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    return frame
+
+
+def write_snapshot(key, frame: pd.DataFrame) -> bool:
+    """Persist a parsed frame; columns Arrow cannot represent just skip it."""
+    if not SNAPSHOTS_ENABLED:
+        return False
+    path = snapshot_path(key)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        import pyarrow.feather as feather
+
+        os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+        if any(name in frame.attrs for name in SNAPSHOT_TRANSIENT_ATTRS):
+            frame = frame.copy(deep=False)
+            frame.attrs = {k: v for k, v in frame.attrs.items() if k not in SNAPSHOT_TRANSIENT_ATTRS}
+        feather.write_feather(frame, tmp_path, compression="uncompressed")
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return False
+    prune_snapshots()
+    return True
+
+
+def prune_snapshots(max_bytes: int = None, max_days: float = None):
+    """Drop snapshots unused for max_days, then least recently used ones beyond the disk budget."""
+    if max_bytes is None:
+        max_bytes = SNAPSHOT_MAX_MB * 1024 * 1024
+    if max_days is None:
+        max_days = SNAPSHOT_MAX_DAYS
+    try:
+        entries = [
+            os.path.join(SNAPSHOT_DIR, name)
+            for name in os.listdir(SNAPSHOT_DIR)
+            if name.endswith(".arrow")
+        ]
+        entries = [(os.stat(path), path) for path in entries]
+    except OSError:
+        return
+    total = sum(info.st_size for info, _ in entries)
+    expired_before = time.time() - max_days * 86400
+    for info, path in sorted(entries, key=lambda e: e[0].st_mtime):
+        if total <= max_bytes and info.st_mtime >= expired_before:
+            break
+        try:
+            os.remove(path)
+            total -= info.st_size
+        except OSError:
+            pass
+
+
+def load_survey(uploaded_file, stream: bool = None, **read_kwargs):
+    """Parse an uploaded CSV/XLS/XLSX once per content hash and parse options.
+
+    The parsed frame is shared by every rerun and every session that
+    uploads the same bytes, so the apps call this directly on each rerun.
+
+    Lookup order: in-process LRU cache, on-disk columnar snapshot, parse.
+    CSVs of SURVEY_STREAM_MB or more (or any CSV with stream=True) are read
+    with read_csv_streaming; the ingest report is kept in attrs["ingest"].
+    Low-cardinality text columns are converted by categorize_columns, with
+    its report in attrs["cardinality"].
+    Returns a shallow copy of the cached frame (callers may add columns
+    freely) or None when the file is missing or cannot be parsed.
+    """
+    if uploaded_file is None:
+        return None
+    ext = file_extension(uploaded_file.name)
+    if not ext:
+        return None
+    if stream is None:
+        stream = _source_size(uploaded_file) >= STREAM_THRESHOLD_MB * 1024 * 1024
+    stream = bool(stream) and ext == ".csv"
+    options = tuple(sorted(read_kwargs.items()))
+    if stream:
+        options += (("stream", True),)
+    key = (file_fingerprint(uploaded_file), ext, options)
+
+    def _load():
+        frame = read_snapshot(key)
+        if frame is None:
+            uploaded_file.seek(0)
+            if stream:
+                frame, report = read_csv_streaming(uploaded_file, **read_kwargs)
+                frame.attrs["ingest"] = report
+            else:
+                frame = parse_survey(uploaded_file, ext, **read_kwargs)
+            frame, cardinality = categorize_columns(frame)
+            frame.attrs["cardinality"] = cardinality
+            write_snapshot(key, frame)
+        return frame
+
+    try:
+        frame = FRAME_CACHE.get_or_compute(key, _load)
+    except Exception:
+        return None
+    frame = frame.copy(deep=False)
+    frame.attrs["fingerprint"] = key[0]
+    return frame
+
+
+def frame_fingerprint(df: pd.DataFrame) -> str:
+    """Content id of a frame: the upload hash when known, else a hash of the values.
+
+    Frames derived by filtering/selecting inherit the upload hash through
+    DataFrame.attrs, so cache keys must add the filter and columns used.
+    """
+    fingerprint = df.attrs.get("fingerprint")
+    if fingerprint is None:
+        row_hashes = pd.util.hash_pandas_object(df, index=True).to_numpy()
+        digest = hashlib.sha256(row_hashes.tobytes())
+        digest.update(repr(list(df.columns)).encode("utf-8"))
+        fingerprint = digest.hexdigest()
+    return fingerprint
+
+
+def load_survey_file(path: str, stream: bool = None, **read_kwargs):
+    """Same as load_survey, for a file on disk (batch / CLI use)."""
+    with open(path, "rb") as f:
+        return load_survey(f, stream=stream, **read_kwargs)
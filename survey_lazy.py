@@ -0,0 +1,40 @@
+import importlib
+
+
+# --------------------------- LAZY MODULES ---------------------------
+class LazyModule:
+    """Stand-in for a heavy module that is imported on first attribute access.
+
+    The upload card only needs streamlit and pandas; plotting, statistics
+    and NLTK are paid for by the first rerun that actually uses them.
+    """
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._module is not None
+
+    def _load(self):
+        if self._module is None:
+            # import_module takes the import lock, so concurrent sessions
+            # cannot see a half-initialised module
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.loaded else "not loaded"
+        return f"<LazyModule {self._name!r} ({state})>"
+
+
+plt = LazyModule("matplotlib.pyplot")
+mpl_figure = LazyModule("matplotlib.figure")
+mpl_agg = LazyModule("matplotlib.backends.backend_agg")
+sns = LazyModule("seaborn")
+scipy_stats = LazyModule("scipy.stats")
+nltk_corpus = LazyModule("nltk.corpus")
@@ -0,0 +1,394 @@
+import os
+
+import numpy as np
+
+from reportlab.graphics import renderPDF
+from reportlab.graphics.shapes import Drawing, Group, Path, PolyLine, Rect, String
+from reportlab.lib.attrmap import AttrMap, AttrMapValue
+from reportlab.lib import colors
+from reportlab.lib.units import inch
+
+# --------------------------- VECTOR REPORT CHARTS ---------------------------
+# The report charts of survey_charts drawn straight into reportlab Drawings:
+# no matplotlib figure, no PNG encoding, and the PDF holds a few path
+# operators per chart instead of a bitmap. Shapes that share a style are
+# merged into one Path (all bars of a series, all markers, all density
+# cells of one shade, all grid lines), so each style is emitted once per
+# chart instead of once per shape; scatter markers go one step further and
+# are a single form XObject per PDF, placed once per point. Inputs are the same precomputed
+# payloads the matplotlib versions take (Histogram, scatter payload,
+# value counts, crosstab percentages).
+FONT = "Helvetica"
+FONT_BOLD = "Helvetica-Bold"
+GREEN = colors.HexColor("#16a34a")
+GREEN_DARK = colors.HexColor("#14532d")
+BAR_GREEN = colors.HexColor("#22c55e")
+POINT_GREEN = colors.HexColor("#10b981")
+TREND_RED = colors.HexColor("#dc2626")
+MEDIAN_ORANGE = colors.HexColor("#f97316")
+GRID_GREY = colors.Color(0.85, 0.85, 0.85)
+DENSITY_SHADES = 8
+# every marker is a path in the PDF, so the density grid takes over sooner
+# than SCATTER_MAX_POINTS does for the bitmap charts
+VECTOR_SCATTER_POINTS = int(os.environ.get("SURVEY_VECTOR_SCATTER_POINTS", "5000"))
+# viridis stops, for the stacked bars (same colormap as the matplotlib version)
+VIRIDIS = ["#440154", "#482878", "#3e4989", "#31688e", "#26828e", "#1f9e89", "#35b779", "#6ece58", "#b5de2b", "#fde725"]
+
+
+def nice_ticks(lo: float, hi: float, target: int = 5) -> np.ndarray:
+    """Round-numbered ticks covering [lo, hi] (1, 2, 2.5 or 5 times a power of ten)."""
+    if not np.isfinite(lo) or not np.isfinite(hi):
+        return np.array([])
+    if hi <= lo:
+        hi = lo + 1.0
+    raw = (hi - lo) / max(target, 1)
+    power = 10.0 ** np.floor(np.log10(raw))
+    step = power * min((m for m in (1, 2, 2.5, 5, 10) if m * power >= raw), default=10)
+    start = np.ceil(lo / step - 1e-9) * step
+    return np.arange(start, hi + step * 1e-9, step)
+
+
+def _fmt(value: float) -> str:
+    value += 0.0  # -0.0 from arange prints as "-0"
+    return f"{value:g}" if abs(value) < 1e6 else f"{value:.2g}"
+
+
+def _short(label, limit: int = 20) -> str:
+    text = str(label)
+    return text if len(text) <= limit else text[: limit - 1] + "…"
+
+
+def _rect_path(path: Path, x: float, y: float, w: float, h: float):
+    path.moveTo(x, y)
+    path.lineTo(x + w, y)
+    path.lineTo(x + w, y + h)
+    path.lineTo(x, y + h)
+    path.closePath()
+
+
+def _circle_path(path: Path, cx: float, cy: float, r: float):
+    k = 0.5523 * r  # cubic Bezier approximation of a quarter circle
+    path.moveTo(cx + r, cy)
+    path.curveTo(cx + r, cy + k, cx + k, cy + r, cx, cy + r)
+    path.curveTo(cx - k, cy + r, cx - r, cy + k, cx - r, cy)
+    path.curveTo(cx - r, cy - k, cx - k, cy - r, cx, cy - r)
+    path.curveTo(cx + k, cy - r, cx + r, cy - k, cx + r, cy)
+    path.closePath()
+
+
+def _text(group, x, y, text, size=7, anchor="middle", bold=False, angle=0, color=colors.black):
+    label = String(0, 0, text, fontName=FONT_BOLD if bold else FONT, fontSize=size, textAnchor=anchor, fillColor=color)
+    holder = Group(label)
+    holder.translate(x, y)
+    if angle:
+        holder.rotate(angle)
+    group.add(holder)
+
+
+class _Axes:
+    """Data -> drawing coordinates for one plot area, plus its frame, grid and labels."""
+
+    def __init__(self, x, y, w, h, xlim, ylim):
+        self.x, self.y, self.w, self.h = x, y, w, h
+        self.x0, self.x1 = xlim
+        self.y0, self.y1 = ylim
+        if self.x1 <= self.x0:
+            self.x1 = self.x0 + 1.0
+        if self.y1 <= self.y0:
+            self.y1 = self.y0 + 1.0
+
+    def px(self, v):
+        return self.x + (np.asarray(v, dtype=float) - self.x0) / (self.x1 - self.x0) * self.w
+
+    def py(self, v):
+        return self.y + (np.asarray(v, dtype=float) - self.y0) / (self.y1 - self.y0) * self.h
+
+    def frame(self, group, x_ticks=None, y_ticks=None, grid_x=False, grid_y=False, under=None):
+        grid = Path(strokeColor=GRID_GREY, strokeWidth=0.4, fillColor=None)
+        ticks = Path(strokeColor=colors.black, strokeWidth=0.5, fillColor=None)
+        for t in [] if x_ticks is None else x_ticks:
+            tx = float(self.px(t))
+            if grid_x:
+                grid.moveTo(tx, self.y)
+                grid.lineTo(tx, self.y + self.h)
+            ticks.moveTo(tx, self.y)
+            ticks.lineTo(tx, self.y - 2.5)
+            _text(group, tx, self.y - 10, _fmt(t), size=6.5)
+        for t in [] if y_ticks is None else y_ticks:
+            ty = float(self.py(t))
+            if grid_y:
+                grid.moveTo(self.x, ty)
+                grid.lineTo(self.x + self.w, ty)
+            ticks.moveTo(self.x, ty)
+            ticks.lineTo(self.x - 2.5, ty)
+            _text(group, self.x - 4, ty - 2.2, _fmt(t), size=6.5, anchor="end")
+        # grid first so the data sits on top of it
+        if under is not None:
+            under.add(grid)
+        else:
+            group.contents.insert(0, grid)
+        group.add(ticks)
+        group.add(Rect(self.x, self.y, self.w, self.h, strokeColor=colors.black, strokeWidth=0.6, fillColor=None))
+
+    def labels(self, group, title=None, xlabel=None, ylabel=None):
+        if title:
+            _text(group, self.x + self.w / 2, self.y + self.h + 5, title, size=8.5, bold=True)
+        if xlabel:
+            _text(group, self.x + self.w / 2, self.y - 20, xlabel, size=7)
+        if ylabel:
+            _text(group, self.x - 24, self.y + self.h / 2, ylabel, size=7, angle=90)
+
+
+class VectorChart(Drawing):
+    """Drawing with scatter markers stamped from one shared form XObject.
+
+    Paint order is underlay (grid lines), markers, then the drawing itself.
+    The markers only exist in PDF output (platypus), which is all the report
+    needs.
+    """
+
+    MARKER_FORM = "survey_scatter_marker"
+    MARKER_RADIUS = 2.6
+
+    _attrMap = AttrMap(BASE=Drawing, underlay=AttrMapValue(None), markers=AttrMapValue(None))
+
+    def __init__(self, width, height):
+        super().__init__(width, height)
+        self.hAlign = "CENTER"  # like the PNG images it replaces
+        self.underlay = Group()
+        self.markers = None
+
+    def _define_marker(self, canv):
+        r = self.MARKER_RADIUS
+        canv.beginForm(self.MARKER_FORM, -r - 1, -r - 1, r + 1, r + 1)
+        canv.setFillColor(POINT_GREEN, alpha=0.6)
+        canv.setStrokeColor(colors.black)
+        canv.setLineWidth(0.3)
+        canv.circle(0, 0, r, stroke=1, fill=1)
+        canv.endForm()
+
+    def draw(self, showBoundary=None):
+        canv = self.canv
+        if self.underlay.contents:
+            renderPDF.draw(Drawing(self.width, self.height, self.underlay), canv, 0, 0)
+        if self.markers is not None:
+            if not canv.hasForm(self.MARKER_FORM):
+                self._define_marker(canv)
+            # relative moves between points rounded to 0.1pt: short operators
+            xs, ys = (np.round(v, 1) for v in self.markers)
+            dx = np.round(np.diff(xs, prepend=0.0), 1).tolist()
+            dy = np.round(np.diff(ys, prepend=0.0), 1).tolist()
+            canv.saveState()
+            for step_x, step_y in zip(dx, dy):
+                canv.translate(step_x, step_y)
+                canv.doForm(self.MARKER_FORM)
+            canv.restoreState()
+        if showBoundary is None:
+            super().draw()
+        else:
+            super().draw(showBoundary)
+
+
+def _new_drawing(width: float, height: float):
+    drawing = VectorChart(width * inch, height * inch)
+    group = Group()
+    drawing.add(group)
+    return drawing, group
+
+
+def _box_stats(values: np.ndarray):
+    """Quartiles, 1.5 IQR whiskers and distinct fliers, as matplotlib's boxplot draws them."""
+    q1, med, q3 = np.percentile(values, [25, 50, 75])
+    iqr = q3 - q1
+    inside = values[(values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)]
+    lo, hi = (inside.min(), inside.max()) if inside.size else (q1, q3)
+    fliers = np.unique(values[(values < lo) | (values > hi)])
+    return q1, med, q3, lo, hi, fliers
+
+
+def _clip_line(slope: float, intercept: float, x_range, y_range):
+    """End points ((x0, x1), (y0, y1)) of y = slope * x + intercept inside the box, or None.
+
+    The segment is cut where the line crosses the bottom or top edge, so it
+    stays straight (clamping y alone would bend it).
+    """
+    x_lo, x_hi = x_range
+    y_lo, y_hi = y_range
+    if slope == 0:
+        if not y_lo <= intercept <= y_hi:
+            return None
+    else:
+        xa, xb = sorted(((y_lo - intercept) / slope, (y_hi - intercept) / slope))
+        x_lo, x_hi = max(x_lo, xa), min(x_hi, xb)
+        if x_lo > x_hi:
+            return None
+    xs = np.array([x_lo, x_hi], dtype=float)
+    return xs, np.clip(slope * xs + intercept, y_lo, y_hi)
+
+
+# --------------------------- CHARTS ---------------------------
+def vector_distribution(col, hist, values, width=6.5, height=2.2):
+    drawing, g = _new_drawing(width, height)
+    W, H = width * inch, height * inch
+    panel = W / 2
+
+    # histogram (bars + KDE)
+    counts, edges = np.asarray(hist.counts, dtype=float), np.asarray(hist.edges, dtype=float)
+    top = max(counts.max() if counts.size else 1.0, np.nanmax(hist.kde_y) if hist.kde_y is not None else 0.0)
+    ax = _Axes(40, 30, panel - 52, H - 48, (edges[0], edges[-1]), (0, top * 1.05))
+    bars = Path(fillColor=GREEN, fillOpacity=0.7, strokeColor=colors.black, strokeWidth=0.4)
+    for left, right, c in zip(edges[:-1], edges[1:], counts):
+        if c > 0:
+            x0 = float(ax.px(left))
+            _rect_path(bars, x0, ax.y, float(ax.px(right)) - x0, float(ax.py(c)) - ax.y)
+    g.add(bars)
+    if hist.kde_x is not None:
+        pts = np.column_stack([ax.px(hist.kde_x), ax.py(hist.kde_y)]).ravel().tolist()
+        g.add(PolyLine(pts, strokeColor=GREEN_DARK, strokeWidth=1.2))
+    ax.frame(g, nice_ticks(edges[0], edges[-1]), nice_ticks(0, top * 1.05, 4), grid_x=True, grid_y=True)
+    ax.labels(g, f"Histogram - {col}", "Value", "Frequency")
+
+    # boxplot
+    values = np.asarray(values, dtype=float)
+    q1, med, q3, lo, hi, fliers = _box_stats(values)
+    span_lo = min(lo, fliers.min()) if fliers.size else lo
+    span_hi = max(hi, fliers.max()) if fliers.size else hi
+    pad = (span_hi - span_lo) * 0.05 or 0.5
+    bx = _Axes(panel + 40, 30, panel - 52, H - 48, (0.5, 1.5), (span_lo - pad, span_hi + pad))
+    cx, half = float(bx.px(1.0)), bx.w * 0.12
+    box = Path(fillColor=None, strokeColor=colors.black, strokeWidth=0.7)
+    _rect_path(box, cx - half, float(bx.py(q1)), 2 * half, float(bx.py(q3) - bx.py(q1)))
+    for end, start in ((lo, q1), (hi, q3)):
+        box.moveTo(cx, float(bx.py(start)))
+        box.lineTo(cx, float(bx.py(end)))
+        box.moveTo(cx - half / 2, float(bx.py(end)))
+        box.lineTo(cx + half / 2, float(bx.py(end)))
+    g.add(box)
+    g.add(PolyLine([cx - half, float(bx.py(med)), cx + half, float(bx.py(med))], strokeColor=MEDIAN_ORANGE, strokeWidth=1))
+    if fliers.size:
+        marks = Path(fillColor=None, strokeColor=colors.black, strokeWidth=0.4)
+        # fliers closer than half a point would print as one mark anyway
+        for fy in np.unique(np.round(bx.py(fliers) * 2) / 2).tolist():
+            _circle_path(marks, cx, fy, 2)
+        g.add(marks)
+    bx.frame(g, None, nice_ticks(span_lo - pad, span_hi + pad, 4), grid_y=True)
+    _text(g, cx, bx.y - 10, "1", size=6.5)
+    bx.labels(g, f"Boxplot - {col}", None, "Value")
+    return drawing
+
+
+def vector_scatter(x_col, y_col, payload, width=4.5, height=3):
+    drawing, g = _new_drawing(width, height)
+    W, H = width * inch, height * inch
+    if "grid" in payload:
+        counts, x_edges, y_edges = payload["grid"]
+        xlim, ylim = (x_edges[0], x_edges[-1]), (y_edges[0], y_edges[-1])
+    else:
+        xs, ys = payload["points"]
+        pad_x = (xs.max() - xs.min()) * 0.05 or 0.5
+        pad_y = (ys.max() - ys.min()) * 0.05 or 0.5
+        xlim = (xs.min() - pad_x, xs.max() + pad_x)
+        ylim = (ys.min() - pad_y, ys.max() + pad_y)
+    ax = _Axes(44, 32, W - 56, H - 50, xlim, ylim)
+
+    if "grid" in payload:
+        # one path per shade instead of one rectangle per cell
+        filled = counts > 0
+        level = np.zeros(counts.shape, dtype=int)
+        if filled.any():
+            logc = np.log10(counts[filled])
+            span = logc.max() - logc.min() or 1.0
+            level[filled] = np.minimum(((logc - logc.min()) / span * DENSITY_SHADES).astype(int), DENSITY_SHADES - 1)
+        for shade in range(DENSITY_SHADES):
+            cells = np.argwhere(filled & (level == shade))
+            if not len(cells):
+                continue
+            t = (shade + 1) / DENSITY_SHADES
+            color = colors.linearlyInterpolatedColor(colors.HexColor("#d9f2e0"), GREEN_DARK, 0, 1, t)
+            path = Path(fillColor=color, strokeColor=None)
+            for i, j in cells:
+                x0, x1 = float(ax.px(x_edges[i])), float(ax.px(x_edges[i + 1]))
+                y0, y1 = float(ax.py(y_edges[j])), float(ax.py(y_edges[j + 1]))
+                _rect_path(path, x0, y0, x1 - x0, y1 - y0)
+            g.add(path)
+        _text(g, ax.x + 3, ax.y + ax.h - 9, f"n = {payload['n']:,}", size=6.5, anchor="start")
+    else:
+        drawing.markers = (ax.px(xs), ax.py(ys))
+
+    segment = None
+    if payload["line"] is not None:
+        segment = _clip_line(*payload["line"], payload["x_range"], (ax.y0, ax.y1))
+    if segment is not None:
+        lx, ly = segment
+        g.add(
+            PolyLine(
+                np.column_stack([ax.px(lx), ax.py(ly)]).ravel().tolist(),
+                strokeColor=TREND_RED,
+                strokeWidth=1.5,
+                strokeDashArray=[4, 2],
+            )
+        )
+        # legend
+        lx0, ly0 = ax.x + ax.w - 48, ax.y + ax.h - 10
+        g.add(PolyLine([lx0, ly0 + 2, lx0 + 14, ly0 + 2], strokeColor=TREND_RED, strokeWidth=1.5, strokeDashArray=[4, 2]))
+        _text(g, lx0 + 18, ly0, "Trend", size=7, anchor="start")
+
+    ax.frame(g, nice_ticks(*xlim), nice_ticks(*ylim), grid_x=True, grid_y=True, under=drawing.underlay)
+    ax.labels(g, f"Scatter {x_col} vs {y_col}", str(x_col), str(y_col))
+    return drawing
+
+
+def _category_axis(g, ax, labels):
+    """Category labels under evenly spaced slots, rotated 45 degrees like the PNG charts."""
+    n = len(labels)
+    for i, label in enumerate(labels):
+        cx = ax.x + (i + 0.5) * ax.w / n
+        _text(g, cx + 2, ax.y - 6, _short(label), size=6, anchor="end", angle=45)
+
+
+def vector_bar(cat_col, freq, width=5, height=2.5):
+    drawing, g = _new_drawing(width, height)
+    W, H = width * inch, height * inch
+    values = np.asarray(freq.to_numpy(), dtype=float)
+    top = values.max() * 1.05 if values.size else 1.0
+    ax = _Axes(40, 56, W - 52, H - 72, (0, max(len(values), 1)), (0, top))
+    bars = Path(fillColor=BAR_GREEN, strokeColor=colors.black, strokeWidth=0.4)
+    slot = ax.w / max(len(values), 1)
+    for i, v in enumerate(values):
+        if v > 0:
+            _rect_path(bars, ax.x + (i + 0.1) * slot, ax.y, 0.8 * slot, float(ax.py(v)) - ax.y)
+    g.add(bars)
+    ax.frame(g, None, nice_ticks(0, top, 4), grid_y=True)
+    _category_axis(g, ax, list(freq.index))
+    ax.labels(g, f"Bar Chart - {cat_col}", None, "Frequency")
+    return drawing
+
+
+def vector_stacked_bar(col_a, col_b, ctab_pct, width=5.5, height=2.8):
+    drawing, g = _new_drawing(width, height)
+    W, H = width * inch, height * inch
+    data = ctab_pct.to_numpy(dtype=float)
+    n_rows, n_series = data.shape
+    legend_w = 70
+    ax = _Axes(40, 56, W - 52 - legend_w, H - 72, (0, max(n_rows, 1)), (0, 100))
+    slot = ax.w / max(n_rows, 1)
+    base = np.zeros(n_rows)
+    for k in range(n_series):
+        color = colors.HexColor(VIRIDIS[round(k * (len(VIRIDIS) - 1) / max(n_series - 1, 1))])
+        path = Path(fillColor=color, strokeColor=None)
+        for i in range(n_rows):
+            v = data[i, k]
+            if v > 0:
+                y0 = float(ax.py(base[i]))
+                _rect_path(path, ax.x + (i + 0.25) * slot, y0, 0.5 * slot, float(ax.py(base[i] + v)) - y0)
+        base += np.nan_to_num(data[:, k])
+        g.add(path)
+        # legend entry
+        ly = ax.y + ax.h - 8 - k * 9
+        if ly > ax.y:
+            g.add(Rect(ax.x + ax.w + 8, ly, 6, 6, fillColor=color, strokeColor=None))
+            _text(g, ax.x + ax.w + 17, ly + 1, _short(ctab_pct.columns[k], 14), size=5.5, anchor="start")
+    ax.frame(g, None, nice_ticks(0, 100, 4), grid_y=True)
+    _category_axis(g, ax, list(ctab_pct.index))
+    ax.labels(g, f"{col_a} vs {col_b} (%)", None, "Percent")
+    return drawing
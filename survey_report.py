@@ -0,0 +1,919 @@
+import logging
+import os
+import tempfile
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO, RawIOBase
+
+import pandas as pd
+
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import inch
+from reportlab.lib import colors
+from reportlab.platypus import (
+    SimpleDocTemplate,
+    Paragraph,
+    Spacer,
+    Table,
+    TableStyle,
+    PageBreak,
+    Image as RLImage,
+)
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+
+from i18n import text_table
+from survey_cache import LRUCache
+from survey_charts import (
+    SCATTER_MAX_POINTS,
+    render_charts_cached,
+    report_bar,
+    report_distribution,
+    report_scatter,
+    report_stacked_bar,
+    scatter_payload,
+)
+from survey_pdf_charts import (
+    VECTOR_SCATTER_POINTS,
+    vector_bar,
+    vector_distribution,
+    vector_scatter,
+    vector_stacked_bar,
+)
+from survey_stats import (
+    cached_association_screen,
+    cached_correlation,
+    cached_crosstab,
+    cached_describe,
+    cached_histogram,
+    cached_value_counts,
+)
+from survey_text import cached_token_counts, stopword_languages, top_words
+
+# --------------------------- SECTION FRAGMENTS ---------------------------
+# Every report section is recorded as a fragment: a tuple of plain items
+# (paragraphs, spacers, tables, charts) rather than reportlab flowables,
+# which are mutated by doc.build and must not be shared between exports.
+# Fragments are cached per (section, data key, language, chart mode, columns
+# used), so a re-export after a small change only records the sections whose
+# inputs changed; PNG charts are cached without the language, so switching
+# language re-records the text around them but renders no chart again.
+REPORT_CACHE_MB = int(os.environ.get("SURVEY_REPORT_CACHE_MB", "64"))
+REPORT_FRAGMENTS = LRUCache(max_bytes=REPORT_CACHE_MB * 1024 * 1024, max_entries=512, name="report")
+
+# "vector": charts are drawn as reportlab Drawings from the chart inputs when
+# the story is assembled (survey_pdf_charts); "png": matplotlib figures are
+# rendered (and cached) as bitmaps, as before.
+REPORT_CHARTS = os.environ.get("SURVEY_REPORT_CHARTS", "vector")
+CHART_MODES = ("vector", "png")
+VECTOR_CHARTS = {
+    report_distribution: vector_distribution,
+    report_scatter: vector_scatter,
+    report_bar: vector_bar,
+    report_stacked_bar: vector_stacked_bar,
+}
+
+GREEN = colors.HexColor("#10B981")
+
+
+class Fragment:
+    """Items of one report section, in story order."""
+
+    def __init__(self):
+        self.items = []
+
+    def para(self, text: str, style: str = "normal"):
+        self.items.append(("para", text, style))
+
+    def space(self, height: float):
+        self.items.append(("space", height))
+
+    def page_break(self):
+        self.items.append(("page_break",))
+
+    def table(self, data, col_widths=None, font_size=8):
+        self.items.append(("table", data, col_widths, font_size))
+
+    def chart(self, key, draw, args, width=6.5, height=2.5):
+        # mode png: placeholder, diganti PNG setelah semua chart selesai dirender;
+        # mode vector: tetap begini, digambar ulang tiap kali story disusun
+        self.items.append(("chart", key, draw, args, width, height))
+
+
+def _report_styles() -> dict:
+    styles = getSampleStyleSheet()
+    return {
+        "title": ParagraphStyle(
+            "Title",
+            parent=styles["Heading1"],
+            fontName="Helvetica-Bold",
+            fontSize=18,
+            textColor=GREEN,
+            alignment=1,
+            spaceAfter=12,
+            spaceBefore=6,
+        ),
+        "h2": ParagraphStyle(
+            "Heading2",
+            parent=styles["Heading2"],
+            fontName="Helvetica-Bold",
+            fontSize=14,
+            textColor=GREEN,
+            spaceBefore=10,
+            spaceAfter=6,
+        ),
+        "h3": ParagraphStyle(
+            "Heading3",
+            parent=styles["Heading3"],
+            fontName="Helvetica-Bold",
+            fontSize=11,
+            textColor=colors.black,
+            spaceBefore=6,
+            spaceAfter=4,
+        ),
+        "normal": ParagraphStyle(
+            "NormalCustom",
+            parent=styles["BodyText"],
+            fontName="Helvetica",
+            fontSize=10,
+            leading=12,
+            spaceAfter=4,
+        ),
+        "small": ParagraphStyle(
+            "Small",
+            parent=styles["BodyText"],
+            fontName="Helvetica",
+            fontSize=8,
+            leading=9.5,
+            spaceAfter=2,
+        ),
+    }
+
+
+def make_table(data, col_widths=None, font_size=8, header_bg=GREEN):
+    if not data:
+        return None
+    tbl = Table(data, colWidths=col_widths, hAlign="LEFT")
+    n_rows = len(data)
+    style_cmds = [
+        ("BACKGROUND", (0, 0), (-1, 0), header_bg),
+        ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
+        ("ALIGN", (0, 0), (-1, 0), "CENTER"),
+        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+        ("FONTSIZE", (0, 0), (-1, 0), font_size),
+        ("FONTNAME", (0, 1), (-1, -1), "Helvetica"),
+        ("FONTSIZE", (0, 1), (-1, -1), font_size),
+        ("TEXTCOLOR", (0, 1), (-1, -1), colors.black),
+        ("ALIGN", (0, 1), (-1, -1), "CENTER"),
+        ("GRID", (0, 0), (-1, -1), 0.25, colors.grey),
+        ("LEFTPADDING", (0, 0), (-1, -1), 3),
+        ("RIGHTPADDING", (0, 0), (-1, -1), 3),
+        ("TOPPADDING", (0, 0), (-1, -1), 2),
+        ("BOTTOMPADDING", (0, 0), (-1, -1), 2),
+    ]
+    if n_rows > 2:
+        for r in range(1, n_rows):
+            if r % 2 == 1:
+                style_cmds.append(
+                    ("BACKGROUND", (0, r), (-1, r), colors.Color(0.96, 0.98, 0.97))
+                )
+    tbl.setStyle(TableStyle(style_cmds))
+    return tbl
+
+
+def _flowables(items, styles: dict):
+    """Fresh reportlab flowables for the items of a rendered fragment."""
+    story = []
+    for item in items:
+        kind = item[0]
+        if kind == "para":
+            story.append(Paragraph(item[1], styles[item[2]]))
+        elif kind == "space":
+            story.append(Spacer(1, item[1] * inch))
+        elif kind == "page_break":
+            story.append(PageBreak())
+        elif kind == "table":
+            tbl = make_table(item[1], col_widths=item[2], font_size=item[3])
+            if tbl:
+                story.append(tbl)
+        elif kind == "image":
+            _, png, width, height = item
+            story.append(RLImage(BytesIO(png), width=width * inch, height=height * inch))
+        elif kind == "chart":
+            # a new Drawing per export: flowables must not be shared between builds
+            _, _, draw, args, width, height = item
+            story.append(VECTOR_CHARTS[draw](*args, width=width, height=height))
+    return story
+
+
+def _top_correlations(corr, numeric_cols, k: int = 5):
+    """(|r|, a, b, r) of the k strongest pairs, strongest first."""
+    corr_pairs = []
+    for i in range(len(numeric_cols)):
+        for j in range(i + 1, len(numeric_cols)):
+            a, b = numeric_cols[i], numeric_cols[j]
+            r = corr.r.loc[a, b]
+            corr_pairs.append((abs(r), a, b, r))
+    corr_pairs.sort(reverse=True)
+    return corr_pairs[:k]
+
+
+# --------------------------- REPORT ARTIFACT ---------------------------
+# Per-session memory cap for an exported report: smaller PDFs stay in RAM,
+# larger ones roll over to a temporary file on disk.
+REPORT_MEMORY_MB = int(os.environ.get("SURVEY_REPORT_MEMORY_MB", "16"))
+
+logger = logging.getLogger(__name__)
+
+
+class ReportArtifact:
+    """The last exported report of one session, spooled to disk above REPORT_MEMORY_MB.
+
+    Written once by build_survey_report_pdf(output=artifact.file); read back
+    through open() only when a download is requested. close() (or garbage
+    collection of the session) removes the temporary file; a download button
+    still on screen then gets an empty file instead of an I/O error.
+    """
+
+    def __init__(self, file_name: str, max_memory_mb: int = None):
+        if max_memory_mb is None:
+            max_memory_mb = REPORT_MEMORY_MB
+        self.file_name = file_name
+        # max_size=0 would mean "never roll over"; a 0 MB cap means always on disk
+        self.max_size = max(1, int(max_memory_mb * 1024 * 1024))
+        self.file = tempfile.SpooledTemporaryFile(max_size=self.max_size, mode="w+b", suffix=".pdf")
+        self._spilled = False
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        with self._lock:
+            return 0 if self.file.closed else self.file.seek(0, os.SEEK_END)
+
+    @property
+    def on_disk(self) -> bool:
+        # the spooled file moves to disk as soon as a write takes it past max_size
+        return self._spilled or self.size > self.max_size
+
+    @property
+    def closed(self) -> bool:
+        return self.file.closed
+
+    def open(self) -> RawIOBase:
+        """A read-only file object over the report, with its own position (empty once closed)."""
+        if self.closed:
+            logger.warning("report %s was requested after it was closed", self.file_name)
+        return _ArtifactReader(self)
+
+    def _read_at(self, offset: int, buffer) -> int:
+        with self._lock:
+            if self.file.closed:
+                return 0
+            self.file.seek(offset)
+            return self.file.readinto(buffer)
+
+    def spill(self):
+        """Move the content to the temporary file on disk, freeing the in-memory copy."""
+        with self._lock:
+            if not self.file.closed:
+                self.file.rollover()
+                self._spilled = True
+
+    def close(self):
+        with self._lock:
+            self.file.close()
+
+
+class _ArtifactReader(RawIOBase):
+    """Reads a ReportArtifact in blocks, so a download never needs a second full copy."""
+
+    def __init__(self, artifact: ReportArtifact):
+        self._artifact = artifact
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        if whence == os.SEEK_CUR:
+            offset += self._pos
+        elif whence == os.SEEK_END:
+            offset += self._artifact.size
+        self._pos = max(0, offset)
+        return self._pos
+
+    def readinto(self, buffer) -> int:
+        count = self._artifact._read_at(self._pos, buffer)
+        self._pos += count
+        return count
+
+
+# --------------------------- PDF REPORT FULL ---------------------------
+def build_survey_report_pdf(
+    df,
+    numeric_cols,
+    cat_cols,
+    text_cols,
+    lang: str = "EN",
+    chart_workers: int = None,
+    data_key=None,
+    output=None,
+    charts: str = None,
+    progress=None,
+):
+    """Full PDF report, written to output (a writable binary file) or to a new BytesIO.
+
+    The report is assembled from section fragments. Sections whose inputs
+    did not change since an earlier export (same data_key, language and
+    columns) come from REPORT_FRAGMENTS; the others are recorded again, and
+    their charts are rendered together at the end (in a process pool when
+    chart_workers > 1, default survey_charts.CHART_WORKERS) unless the same
+    chart is already cached. data_key identifies df in the analysis store,
+    (dataset fingerprint, filter key); with it the statistics come from the
+    same stored results the UI shows, without it they are computed here and
+    nothing is cached. charts is "vector" or "png" (default REPORT_CHARTS);
+    vector charts skip the rendering step altogether. progress, if given, is
+    called as progress(step, total, name) before each section and before the
+    layout, and once more with step == total at the end. Returns output (the
+    BytesIO, rewound, when none is given).
+    """
+    charts = charts or REPORT_CHARTS
+    if charts not in CHART_MODES:
+        raise ValueError(f"charts must be one of {CHART_MODES}, got {charts!r}")
+    # a vector PDF carries every marker, so large scatters switch to the grid sooner
+    scatter_points = VECTOR_SCATTER_POINTS if charts == "vector" else SCATTER_MAX_POINTS
+
+    texts = text_table(lang)
+
+    def get_text(key: str) -> str:
+        return texts[key]
+
+    def chart_key(kind, *cols):
+        return None if data_key is None else ("report", data_key, kind) + cols
+
+    # semua statistik deskriptif numerik sekali jalan, dipakai bagian 1, 1b, 4 dan 8
+    def numeric_summary():
+        return cached_describe(data_key, df[numeric_cols])
+
+    # TITLE + META
+    def section_title(out):
+        out.para(get_text("pdf_title"), "title")
+        meta_lines = [
+            f"Rows: {df.shape[0]}, Columns: {df.shape[1]}",
+            f"Numeric columns: {len(numeric_cols)}, Categorical columns: {len(cat_cols)}, Text columns: {len(text_cols)}",
+        ]
+        for line in meta_lines:
+            out.para(line)
+        out.space(0.2)
+
+    # SUMMARY
+    def section_summary(out):
+        out.para(get_text("pdf_section_summary"), "h2")
+        out.space(0.05)
+
+        out.para(get_text("pdf_summary_overall"), "h3")
+        overall_text = (
+            f"Total responses: {df.shape[0]} | "
+            f"Numeric columns: {len(numeric_cols)} | "
+            f"Categorical columns: {len(cat_cols)} | "
+            f"Text columns: {len(text_cols)}"
+        )
+        out.para(overall_text)
+
+        missing_info = df.isna().sum()
+        mv_rows = [["Column", "Missing", "Percent"]]
+        for col in df.columns:
+            miss = int(missing_info[col])
+            pct = (miss / len(df) * 100) if len(df) > 0 else 0
+            mv_rows.append([col, str(miss), f"{pct:.2f}%"])
+        out.space(0.05)
+        out.para(get_text("pdf_summary_missing"), "h3")
+        out.table(mv_rows, col_widths=[2.5 * inch, 1.2 * inch, 1.2 * inch], font_size=7)
+
+        out.space(0.2)
+
+    # 1. DESCRIPTIVE NUMERIC
+    def section_numdesc(out):
+        out.para(get_text("pdf_section_numdesc"), "h2")
+        out.space(0.05)
+
+        desc = numeric_summary().loc[numeric_cols]
+        desc_rows = [["Column", "Count", "Mean", "Std", "Min", "25%", "50%", "75%", "Max"]]
+        for col in desc.index:
+            row = desc.loc[col]
+            desc_rows.append([
+                col,
+                f"{row['count']:.0f}",
+                f"{row['mean']:.3f}",
+                f"{row['std']:.3f}",
+                f"{row['min']:.3f}",
+                f"{row['25%']:.3f}",
+                f"{row['50%']:.3f}",
+                f"{row['75%']:.3f}",
+                f"{row['max']:.3f}",
+            ])
+        out.table(desc_rows, font_size=6.5)
+        out.space(0.2)
+
+    # 1b. NUMERIC DISTRIBUTIONS
+    def section_numdist(out):
+        summary = numeric_summary()
+        out.para(get_text("pdf_section_numdist"), "h2")
+        out.space(0.1)
+        for col in numeric_cols:
+            row = summary.loc[col]
+            if row["count"] == 0:
+                continue
+            s = pd.to_numeric(df[col], errors="coerce").dropna()
+            stats_dict = {
+                "Mean": f"{row['mean']:.4f}",
+                "Median": f"{row['50%']:.4f}",
+                "Std": f"{row['std']:.4f}",
+                "Min": f"{row['min']:.4f}",
+                "Max": f"{row['max']:.4f}",
+            }
+            out.para(f"<b>{col}</b>", "h3")
+            stats_table_data = [["Statistic", "Value"]] + [[k, v] for k, v in stats_dict.items()]
+            out.table(stats_table_data, col_widths=[2.2 * inch, 2.2 * inch], font_size=8)
+            out.space(0.15)
+
+            hist = cached_histogram(data_key, df[col])
+            out.chart(
+                chart_key("distribution", col),
+                report_distribution,
+                (col, hist, s.to_numpy()),
+                width=6.5,
+                height=2.2,
+            )
+            out.space(0.2)
+
+    # 2. SCATTER PLOTS
+    def section_scatter(out):
+        out.page_break()
+        out.para(get_text("pdf_section_scatter"), "h2")
+        out.space(0.1)
+        pairs_to_plot = min(3, len(numeric_cols) - 1)
+        for i in range(pairs_to_plot):
+            x_col = numeric_cols[i]
+            y_col = numeric_cols[i + 1]
+            x = pd.to_numeric(df[x_col], errors="coerce")
+            y = pd.to_numeric(df[y_col], errors="coerce")
+            mask = x.notna() & y.notna()
+            x_clean, y_clean = x[mask], y[mask]
+            if len(x_clean) < 2:
+                continue
+
+            out.chart(
+                chart_key("scatter", x_col, y_col),
+                report_scatter,
+                (x_col, y_col, scatter_payload(x_clean.to_numpy(), y_clean.to_numpy(), max_points=scatter_points)),
+                width=4.5,
+                height=3,
+            )
+            out.space(0.15)
+
+    # 3. CATEGORICAL BAR CHARTS
+    def section_catbar(out):
+        out.page_break()
+        out.para(get_text("pdf_section_catbar"), "h2")
+        out.space(0.1)
+        for cat_col in cat_cols[:3]:
+            freq = cached_value_counts(data_key, df[cat_col]).head(10)
+            out.chart(chart_key("bar", cat_col), report_bar, (cat_col, freq), width=5, height=2.5)
+            out.space(0.2)
+
+    # 4. NUMERIC FULL STATS
+    def section_numfull(out):
+        summary = numeric_summary()
+        out.page_break()
+        out.para(get_text("pdf_section_numfull"), "h2")
+        out.space(0.1)
+        for col in numeric_cols:
+            row = summary.loc[col]
+            if row["count"] == 0:
+                continue
+            stats_dict = {
+                "Mean": f"{row['mean']:.6f}",
+                "Median": f"{row['50%']:.6f}",
+                "Mode": f"{row['mode']:.6f}",
+                "Std Dev": f"{row['std']:.6f}",
+                "Variance": f"{row['var']:.6f}",
+                "Min": f"{row['min']:.6f}",
+                "Max": f"{row['max']:.6f}",
+                "Range": f"{row['range']:.6f}",
+                "Q1 (25%)": f"{row['25%']:.6f}",
+                "Q3 (75%)": f"{row['75%']:.6f}",
+                "IQR": f"{row['iqr']:.6f}",
+                "Skewness": f"{row['skew']:.6f}",
+                "Kurtosis": f"{row['kurtosis']:.6f}",
+            }
+            out.para(f"<b>{col}</b>", "h3")
+            table_data = [["Statistic", "Value"]] + [[k, v] for k, v in stats_dict.items()]
+            out.table(table_data, col_widths=[2.5 * inch, 2.5 * inch], font_size=7)
+            out.space(0.15)
+
+    # 5. CATEGORICAL FREQUENCY
+    def section_catfreq(out):
+        out.page_break()
+        out.para(get_text("pdf_section_catfreq"), "h2")
+        out.space(0.1)
+        for col in cat_cols:
+            freq = cached_value_counts(data_key, df[col], dropna=False).head(15)
+            pct = (freq / len(df) * 100).round(2)
+            out.para(f"<b>{col}</b> Top 15", "h3")
+            table_data = [["Category", "Count", "Percent"]] + [
+                [str(idx), str(int(freq[idx])), f"{pct[idx]:.2f}"] for idx in freq.index
+            ]
+            out.table(table_data, col_widths=[2 * inch, 1.5 * inch, 1.5 * inch], font_size=7)
+            out.space(0.15)
+
+    # 5b. CATEGORICAL DETAIL (CROSSTAB + CHI-SQUARE)
+    def section_catdetail(out):
+        out.page_break()
+        out.para(get_text("pdf_section_catdetail"), "h2")
+        out.space(0.1)
+
+        # peringkat semua pasangan; detail untuk 3 asosiasi terkuat
+        screen = cached_association_screen(data_key, df[cat_cols])
+        ranked = screen.dropna(subset=["cramers_v"])
+        if not ranked.empty:
+            out.para(get_text("association_screen"), "h3")
+            rows = [["Variable A", "Variable B", "N", "Chi-square", "df", "p-value", "Cramér's V"]]
+            for rec in ranked.head(10).itertuples(index=False):
+                rows.append(
+                    [
+                        str(rec.var_a),
+                        str(rec.var_b),
+                        str(rec.n),
+                        f"{rec.chi2:.3f}",
+                        str(rec.dof),
+                        f"{rec.p_value:.4f}",
+                        f"{rec.cramers_v:.3f}",
+                    ]
+                )
+            out.table(rows, font_size=6.5)
+            out.space(0.2)
+
+        if ranked.empty:
+            # kolom di luar screen (terlalu banyak level): pasangan berurutan seperti sebelumnya
+            detail_pairs = [(cat_cols[i], cat_cols[i + 1], None) for i in range(min(3, len(cat_cols) - 1))]
+        else:
+            detail_pairs = [(rec.var_a, rec.var_b, rec) for rec in ranked.head(3).itertuples(index=False)]
+        for col_a, col_b, rec in detail_pairs:
+            out.para(f"<b>{col_a}</b> x <b>{col_b}</b>", "h3")
+
+            ctab = cached_crosstab(data_key, df[col_a], df[col_b])
+            if ctab.empty:
+                out.para(get_text("pdf_catdetail_nodata"), "small")
+                out.space(0.1)
+                continue
+
+            ctab_pct = ctab.div(ctab.sum(axis=1), axis=0) * 100
+
+            rows = [[""] + list(ctab.columns)]
+            for idx in ctab.index[:10]:
+                row = [str(idx)]
+                for c in ctab.columns:
+                    row.append(f"{ctab.loc[idx, c]} ({ctab_pct.loc[idx, c]:.1f}%)")
+                rows.append(row)
+            out.table(rows, font_size=6.5)
+
+            out.space(0.05)
+            out.chart(
+                chart_key("stacked_bar", col_a, col_b),
+                report_stacked_bar,
+                (col_a, col_b, ctab_pct),
+                width=5.5,
+                height=2.8,
+            )
+            out.space(0.2)
+
+            # chi-square untuk pasangan ini (sudah dihitung oleh screen)
+            if rec is not None:
+                chi_text = f"Chi-square: {rec.chi2:.3f}, df={rec.dof}, p-value={rec.p_value:.4f}"
+                out.para(chi_text, "small")
+                out.space(0.1)
+
+    # 6. CORRELATION MATRIX + DETAIL
+    def section_corr(out):
+        out.page_break()
+        out.para(get_text("pdf_section_corr"), "h2")
+        out.space(0.1)
+        corr = cached_correlation(data_key, df[numeric_cols], "pearson")
+        corr_matrix = corr.r
+        table_data = [["Variable"] + list(numeric_cols)]
+        for var in numeric_cols:
+            row = [var]
+            for col in numeric_cols:
+                r = corr_matrix.loc[var, col]
+                row.append(f"{r:.3f}")
+            table_data.append(row)
+        col_width = 6.5 / (len(numeric_cols) + 1)
+        out.table(
+            table_data,
+            col_widths=[col_width * inch for _ in range(len(numeric_cols) + 1)],
+            font_size=7,
+        )
+        out.space(0.2)
+
+        # detail korelasi
+        out.space(0.1)
+        out.para(get_text("pdf_section_corrdetail"), "h3")
+
+        corr_rows = [["Var A", "Var B", "r", "p-value", "N"]]
+        for _, a, b, r in _top_correlations(corr, numeric_cols):
+            n_ab = int(corr.n.loc[a, b])
+            if n_ab >= 3:
+                p_val = corr.p.loc[a, b]
+                corr_rows.append([a, b, f"{r:.3f}", f"{p_val:.4f}", str(n_ab)])
+        out.table(corr_rows, font_size=7)
+        out.space(0.2)
+
+    # 7. TEXT ANALYSIS
+    def section_text(out):
+        out.page_break()
+        out.para(get_text("pdf_section_text"), "h2")
+        out.space(0.1)
+        for col in text_cols[:2]:
+            out.para(f"<b>{col}</b>", "h3")
+            word_counts = cached_token_counts(data_key, df[col], language=stopword_languages(lang))
+            if word_counts.empty:
+                out.para(get_text("pdf_notext"), "small")
+                out.space(0.1)
+                continue
+            word_freq = top_words(word_counts, 15)
+            table_data = [["Word", "Frequency"]] + [[word, str(count)] for word, count in word_freq]
+            out.table(table_data, col_widths=[3.5 * inch, 2 * inch], font_size=8)
+            out.space(0.2)
+
+            lengths = df[col].dropna().astype(str).str.len()
+            if not lengths.empty:
+                len_stats = {
+                    "Min length": lengths.min(),
+                    "Max length": lengths.max(),
+                    "Mean length": lengths.mean(),
+                    "Median length": lengths.median(),
+                }
+                len_rows = [["Metric", "Value"]] + [
+                    [k, f"{v:.1f}" if isinstance(v, float) else str(v)]
+                    for k, v in len_stats.items()
+                ]
+                out.space(0.05)
+                out.table(len_rows, col_widths=[2.5 * inch, 2 * inch], font_size=8)
+
+            out.space(0.05)
+            out.para(get_text("pdf_text_samples"), "small")
+            examples = df[col].dropna().astype(str).head(5).tolist()
+            for idx, ex in enumerate(examples, 1):
+                out.para(f"{idx}. {ex}", "small")
+            out.space(0.2)
+
+    # 8. INSIGHTS & HIGHLIGHTS
+    def section_insights(out):
+        out.page_break()
+        out.para(get_text("pdf_section_insights"), "h2")
+        out.space(0.1)
+
+        bullets = []
+
+        if numeric_cols:
+            summary = numeric_summary()
+            for col in numeric_cols[:3]:
+                row = summary.loc[col]
+                if row["count"] > 0:
+                    bullets.append(
+                        f"{col}: mean={row['mean']:.2f}, median={row['50%']:.2f}, std={row['std']:.2f}, range=({row['min']:.2f}–{row['max']:.2f})"
+                    )
+
+        for col in cat_cols[:3]:
+            top = cached_value_counts(data_key, df[col], normalize=True).head(3)
+            if not top.empty:
+                parts = [f"{idx} ({pct*100:.1f}%)" for idx, pct in top.items()]
+                bullets.append(f"{col}: top categories → " + ", ".join(parts))
+
+        if len(numeric_cols) > 1:
+            corr = cached_correlation(data_key, df[numeric_cols], "pearson")
+            for _, a, b, r in _top_correlations(corr, numeric_cols)[:3]:
+                bullets.append(f"Strong correlation between {a} and {b}: r={r:.3f}")
+
+        if not bullets:
+            bullets.append(get_text("pdf_insight_none"))
+
+        for b in bullets:
+            out.para(f"• {b}")
+
+    # (nama, kolom yang dipakai, builder) dalam urutan laporan
+    sections = [
+        ("title", (df.shape, len(numeric_cols), len(cat_cols), len(text_cols)), section_title),
+        ("summary", (tuple(df.columns), len(numeric_cols), len(cat_cols), len(text_cols)), section_summary),
+    ]
+    if numeric_cols:
+        sections.append(("numdesc", tuple(numeric_cols), section_numdesc))
+        sections.append(("numdist", tuple(numeric_cols), section_numdist))
+    if len(numeric_cols) > 1:
+        sections.append(("scatter", tuple(numeric_cols[:4]), section_scatter))
+    if cat_cols:
+        sections.append(("catbar", tuple(cat_cols[:3]), section_catbar))
+    if numeric_cols:
+        sections.append(("numfull", tuple(numeric_cols), section_numfull))
+    if cat_cols:
+        sections.append(("catfreq", tuple(cat_cols), section_catfreq))
+    if len(cat_cols) >= 2:
+        sections.append(("catdetail", tuple(cat_cols), section_catdetail))
+    if len(numeric_cols) > 1:
+        sections.append(("corr", tuple(numeric_cols), section_corr))
+    if text_cols:
+        sections.append(("text", tuple(text_cols[:2]), section_text))
+    sections.append(("insights", (tuple(numeric_cols), tuple(cat_cols[:3])), section_insights))
+
+    total_steps = len(sections) + 1
+
+    def report_progress(step: int, name: str):
+        if progress is not None:
+            progress(step, total_steps, name)
+
+    fragments = []
+    recorded = []
+    for step, (name, inputs, build) in enumerate(sections):
+        report_progress(step, name)
+        key = None if data_key is None else (name, data_key, lang, charts, inputs)
+        items = None if key is None else REPORT_FRAGMENTS.get(key)
+        if items is None:
+            out = Fragment()
+            build(out)
+            items = out.items
+            recorded.append((key, len(fragments)))
+        fragments.append(items)
+
+    report_progress(len(sections), "layout")
+    # chart dari semua section yang direkam ulang dirender sekali jalan
+    chart_slots = [
+        (index, pos)
+        for _, index in recorded
+        for pos, item in enumerate(fragments[index])
+        if item[0] == "chart" and charts == "png"
+    ]
+    jobs = [fragments[index][pos][1:4] for index, pos in chart_slots]
+    images = render_charts_cached(jobs, workers=chart_workers)
+    for (index, pos), png in zip(chart_slots, images):
+        width, height = fragments[index][pos][4:6]
+        fragments[index][pos] = ("image", png, width, height)
+    for key, index in recorded:
+        fragments[index] = tuple(fragments[index])
+        if key is not None:
+            REPORT_FRAGMENTS.put(key, fragments[index])
+
+    buffer = BytesIO() if output is None else output
+    doc = SimpleDocTemplate(
+        buffer,
+        pagesize=A4,
+        leftMargin=0.5 * inch,
+        rightMargin=0.5 * inch,
+        topMargin=0.5 * inch,
+        bottomMargin=0.5 * inch,
+    )
+    styles = _report_styles()
+    story = []
+    for items in fragments:
+        story.extend(_flowables(items, styles))
+    doc.build(story)
+    report_progress(total_steps, "done")
+    if output is None:
+        buffer.seek(0)
+    return buffer
+
+
+# --------------------------- EXPORT JOBS ---------------------------
+# Exports from the dashboard run on a small thread pool shared by every
+# session instead of in the Streamlit script thread, so the page stays usable
+# while a report is built and the script only polls the job. The queue holds
+# at most EXPORT_QUEUE_SIZE unfinished jobs and one per session (a session
+# asking again gets its running job back), so one user cannot fill it and
+# starve the others; jobs start in submission order. Threads rather than
+# processes: the builds share the analysis store and the fragment cache with
+# the UI, and PNG charts already go to survey_charts' process pool.
+EXPORT_WORKERS = int(os.environ.get("SURVEY_EXPORT_WORKERS", "2"))
+EXPORT_QUEUE_SIZE = int(os.environ.get("SURVEY_EXPORT_QUEUE_SIZE", "8"))
+
+
+class ExportQueueFull(RuntimeError):
+    """Raised by ExportQueue.submit when no more jobs can be accepted."""
+
+
+class ExportJob:
+    """One background export: its state, progress by section and the resulting artifact."""
+
+    def __init__(self, owner, file_name: str):
+        self.id = uuid.uuid4().hex[:12]
+        self.owner = owner
+        self.artifact = ReportArtifact(file_name)
+        self.state = "queued"  # queued -> running -> done | failed | cancelled
+        self.step = 0
+        self.total = 0
+        self.section = None
+        self.error = None
+        self.future = None
+        self._discard = False
+        self._lock = threading.Lock()
+
+    @property
+    def finished(self) -> bool:
+        return self.state in ("done", "failed", "cancelled")
+
+    @property
+    def fraction(self) -> float:
+        return self.step / self.total if self.total else 0.0
+
+    def _progress(self, step: int, total: int, section: str):
+        self.step, self.total, self.section = step, total, section
+
+    def close(self):
+        """Drop the job: cancel it if still queued, free the artifact once it is not being written."""
+        with self._lock:
+            if self.future is not None and self.future.cancel():
+                self.state = "cancelled"
+            if self.finished:
+                self.artifact.close()
+            else:
+                # still being written; _run closes it at the end
+                self._discard = True
+
+    def _finish(self, state: str, error=None):
+        with self._lock:
+            self.state, self.error = state, error
+            if state == "failed" or self._discard:
+                self.artifact.close()
+
+
+class ExportQueue:
+    """Bounded FIFO of ExportJobs run by a lazily started thread pool."""
+
+    def __init__(self, workers: int = None, max_jobs: int = None):
+        self.workers = max(1, EXPORT_WORKERS if workers is None else workers)
+        self.max_jobs = max(1, EXPORT_QUEUE_SIZE if max_jobs is None else max_jobs)
+        self._jobs = OrderedDict()  # unfinished jobs by id, in submission order
+        self._lock = threading.Lock()
+        self._pool = None
+
+    def submit(self, owner, file_name: str, *args, **kwargs) -> ExportJob:
+        """Queue build_survey_report_pdf(*args, **kwargs) for owner (one job per owner)."""
+        with self._lock:
+            for job in self._jobs.values():
+                if job.owner == owner:
+                    return job
+            if len(self._jobs) >= self.max_jobs:
+                raise ExportQueueFull(f"{len(self._jobs)} exports already queued")
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="pdf-export")
+            job = ExportJob(owner, file_name)
+            self._jobs[job.id] = job
+            job.future = self._pool.submit(self._run, job, args, kwargs)
+        # outside the lock: a job that already finished runs the callback right here
+        job.future.add_done_callback(lambda _, job_id=job.id: self._forget(job_id))
+        return job
+
+    def position(self, job: ExportJob) -> int:
+        """Number of queued jobs that will start before this one (0 once it runs)."""
+        with self._lock:
+            ahead = 0
+            for other in self._jobs.values():
+                if other is job:
+                    return ahead if job.state == "queued" else 0
+                if other.state == "queued":
+                    ahead += 1
+        return 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            states = [job.state for job in self._jobs.values()]
+        return {
+            "queued": states.count("queued"),
+            "running": states.count("running"),
+            "workers": self.workers,
+            "max_jobs": self.max_jobs,
+        }
+
+    def _forget(self, job_id):
+        with self._lock:
+            job = self._jobs.pop(job_id, None)
+        if job is not None and job.state == "queued":
+            job.state = "cancelled"
+
+    def _run(self, job: ExportJob, args, kwargs):
+        job.state = "running"
+        try:
+            build_survey_report_pdf(*args, output=job.artifact.file, progress=job._progress, **kwargs)
+        except Exception as exc:
+            job._finish("failed", exc)
+        else:
+            job._finish("done")
+
+
+EXPORT_QUEUE = ExportQueue()
@@ -0,0 +1,740 @@
+import re
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+from survey_cache import analysis_result
+from survey_lazy import scipy_stats
+
+# --------------------------- LIKERT DECODER ---------------------------
+LIKERT_NUMBER = re.compile(r"\d+")
+
+
+def likert_score(label) -> float:
+    """'5 = Strongly agree' -> 5.0; numbers pass through; anything else -> NaN."""
+    if isinstance(label, (int, float, np.integer, np.floating)) and not isinstance(label, bool):
+        return float(label)
+    match = LIKERT_NUMBER.search(str(label))
+    return float(match.group()) if match else np.nan
+
+
+def decode_likert(df_sub: pd.DataFrame, dtype=np.float32) -> pd.DataFrame:
+    """Convert Likert answer columns to numeric scores.
+
+    Every column is factorized (or its categorical codes reused), each
+    distinct answer string is parsed once into a shared lookup table, and
+    the scores are gathered with a single take over the integer codes.
+    Missing answers become NaN.
+    """
+    scores = {}
+    out = {}
+    for col in df_sub.columns:
+        s = df_sub[col]
+        if isinstance(s.dtype, pd.CategoricalDtype):
+            codes = s.cat.codes.to_numpy()
+            uniques = s.cat.categories
+        else:
+            codes, uniques = pd.factorize(s, sort=False)
+        lookup = np.empty(len(uniques) + 1, dtype=dtype)
+        for i, label in enumerate(uniques):
+            if label not in scores:
+                scores[label] = likert_score(label)
+            lookup[i] = scores[label]
+        # code -1 (missing) indexes the trailing NaN slot
+        lookup[-1] = np.nan
+        out[col] = lookup[codes]
+    return pd.DataFrame(out, index=df_sub.index)
+
+
+# --------------------------- DESCRIPTIVE KERNEL ---------------------------
+DESCRIBE_STATS = [
+    "count", "mean", "std", "var", "min", "25%", "50%", "75%", "max",
+    "range", "iqr", "skew", "kurtosis", "mode",
+]
+
+
+def _sorted_mode(sorted_block: np.ndarray, count: np.ndarray) -> np.ndarray:
+    """Smallest most frequent value per column of a column-sorted block (NaNs last)."""
+    k, n = sorted_block.shape
+    mode = np.full(k, np.nan)
+    valid = np.arange(n)[None, :] < count[:, None]
+    start = valid.copy()
+    start[:, 1:] &= sorted_block[:, 1:] != sorted_block[:, :-1]
+    runs_per_col = start.sum(axis=1)
+    if runs_per_col.sum() == 0:
+        return mode
+    run_id = np.cumsum(start.ravel()) - 1
+    lengths = np.bincount(run_id[valid.ravel()], minlength=int(runs_per_col.sum()))
+    run_col = np.repeat(np.arange(k), runs_per_col)
+    run_val = sorted_block.ravel()[start.ravel()]
+    has = runs_per_col > 0
+    offsets = np.concatenate(([0], np.cumsum(runs_per_col)[:-1]))[has]
+    best = np.zeros(k, dtype=lengths.dtype)
+    best[has] = np.maximum.reduceat(lengths, offsets)
+    idx = np.flatnonzero(lengths == best[run_col])
+    cols, first = np.unique(run_col[idx], return_index=True)
+    mode[cols] = run_val[idx[first]]
+    return mode
+
+
+def describe_block(num_df: pd.DataFrame) -> pd.DataFrame:
+    """All descriptive statistics for every column at once (rows: columns, cols: DESCRIBE_STATS).
+
+    One column-wise sort gives min/max, quartiles (linear, like pandas) and
+    the mode; one pass of centered powers gives mean, std/var, skew and
+    kurtosis with pandas' bias corrections. NaNs are ignored per column.
+    """
+    data = num_df.apply(pd.to_numeric, errors="coerce")
+    block = np.ascontiguousarray(data.to_numpy(dtype=np.float64).T)
+    k, n = block.shape
+    ok = ~np.isnan(block)
+    count = ok.sum(axis=1)
+    cnt = count.astype(np.float64)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        # pass 1: moments
+        mean = np.where(ok, block, 0.0).sum(axis=1) / cnt
+        dev = np.where(ok, block - mean[:, None], 0.0)
+        dev2 = dev * dev
+        m2 = dev2.sum(axis=1)
+        m3 = (dev2 * dev).sum(axis=1)
+        m4 = (dev2 * dev2).sum(axis=1)
+        del dev, dev2
+        var = np.where(count > 1, m2 / (cnt - 1), np.nan)
+        # pandas' nanops zeroes floating-point noise in the central moments
+        m2 = np.where(np.abs(m2) < 1e-14, 0.0, m2)
+        m3 = np.where(np.abs(m3) < 1e-14, 0.0, m3)
+        m4 = np.where(np.abs(m4) < 1e-14, 0.0, m4)
+        skew = cnt * np.sqrt(cnt - 1) / (cnt - 2) * (m3 / m2**1.5)
+        skew = np.where(m2 == 0, 0.0, skew)
+        skew[count < 3] = np.nan
+        numer = cnt * (cnt + 1) * (cnt - 1) * m4
+        denom = (cnt - 2) * (cnt - 3) * m2**2
+        kurt = numer / denom - 3 * (cnt - 1) ** 2 / ((cnt - 2) * (cnt - 3))
+        kurt = np.where(denom == 0, 0.0, kurt)
+        kurt[count < 4] = np.nan
+
+        # pass 2: order statistics from one sort
+        ordered = np.sort(block, axis=1)
+        last = np.maximum(count - 1, 0)
+
+        def quantile(q):
+            pos = last * q
+            lo = np.floor(pos).astype(np.intp)
+            hi = np.ceil(pos).astype(np.intp)
+            rows = np.arange(k)
+            return ordered[rows, lo] + (ordered[rows, hi] - ordered[rows, lo]) * (pos - lo)
+
+        empty = count == 0
+        stats_cols = {
+            "count": cnt,
+            "mean": mean,
+            "std": np.sqrt(var),
+            "var": var,
+            "min": ordered[:, 0] if n else np.full(k, np.nan),
+            "25%": quantile(0.25) if n else np.full(k, np.nan),
+            "50%": quantile(0.5) if n else np.full(k, np.nan),
+            "75%": quantile(0.75) if n else np.full(k, np.nan),
+            "max": ordered[np.arange(k), last] if n else np.full(k, np.nan),
+            "skew": skew,
+            "kurtosis": kurt,
+            "mode": _sorted_mode(ordered, count),
+        }
+    out = pd.DataFrame(stats_cols, index=num_df.columns)
+    for col in ("min", "25%", "50%", "75%", "max"):
+        out.loc[empty, col] = np.nan
+    out["range"] = out["max"] - out["min"]
+    out["iqr"] = out["75%"] - out["25%"]
+    return out[DESCRIBE_STATS]
+
+
+def cached_describe(key, num_df: pd.DataFrame) -> pd.DataFrame:
+    """describe_block from the analysis store, per (dataset/filter key, column set)."""
+    return analysis_result(key, ("describe", tuple(num_df.columns)), lambda: describe_block(num_df))
+
+
+# --------------------------- BINNING SERVICE ---------------------------
+# Histogram counts and the KDE curve of a numeric column, computed once and
+# drawn by every renderer (dashboard, PDF, legacy dashboard). The KDE is a
+# Gaussian kernel with Scott's bandwidth (as scipy/seaborn use) evaluated by
+# linear binning onto a regular grid plus one FFT convolution, so its cost
+# is O(n + grid log grid) instead of O(n * grid).
+HIST_BINS = 20
+KDE_GRID = 512
+KDE_CUT = 3  # grid margin in bandwidths, so the kernel mass does not wrap around
+
+Histogram = namedtuple("Histogram", ["counts", "edges", "kde_x", "kde_y", "n"])
+
+
+def fft_kde(x: np.ndarray, grid_size: int = KDE_GRID):
+    """(grid, density) of a Gaussian KDE over [min(x), max(x)], or None if undefined."""
+    n = len(x)
+    if n < 2:
+        return None
+    bw = x.std(ddof=1) * n ** -0.2
+    if not bw > 0:
+        return None
+    lo, hi = x.min() - KDE_CUT * bw, x.max() + KDE_CUT * bw
+    grid = np.linspace(lo, hi, grid_size)
+    delta = grid[1] - grid[0]
+
+    # linear binning: each point splits its weight between the two nearest grid nodes
+    pos = (x - lo) / delta
+    left = np.minimum(pos.astype(np.intp), grid_size - 2)
+    frac = pos - left
+    weights = np.bincount(left, weights=1.0 - frac, minlength=grid_size)
+    weights += np.bincount(left + 1, weights=frac, minlength=grid_size)
+
+    # zero padding to twice the grid keeps the FFT convolution linear, not circular
+    size = 2 * grid_size
+    offsets = np.arange(size)
+    offsets = np.minimum(offsets, size - offsets) * delta
+    kernel = np.exp(-0.5 * (offsets / bw) ** 2)
+    smooth = np.fft.irfft(np.fft.rfft(weights, size) * np.fft.rfft(kernel), size)[:grid_size]
+    density = np.maximum(smooth, 0.0) / (n * bw * np.sqrt(2 * np.pi))
+
+    inside = (grid >= x.min()) & (grid <= x.max())
+    return grid[inside], density[inside]
+
+
+def histogram_bins(values, bins: int = HIST_BINS, kde: bool = True) -> Histogram:
+    """Counts over equal-width bins plus the KDE scaled to counts per bin."""
+    x = pd.to_numeric(pd.Series(values), errors="coerce").to_numpy(dtype=np.float64)
+    x = x[~np.isnan(x)]
+    if x.size == 0:
+        edges = np.linspace(0.0, 1.0, bins + 1)
+        return Histogram(np.zeros(bins, dtype=np.int64), edges, None, None, 0)
+    counts, edges = np.histogram(x, bins=bins)
+    kde_x = kde_y = None
+    curve = fft_kde(x) if kde else None
+    if curve is not None:
+        kde_x, density = curve
+        kde_y = density * x.size * (edges[1] - edges[0])
+    return Histogram(counts, edges, kde_x, kde_y, int(x.size))
+
+
+def cached_histogram(key, series: pd.Series, bins: int = HIST_BINS) -> Histogram:
+    """histogram_bins from the analysis store, per (dataset/filter key, column, bins)."""
+    return analysis_result(key, ("histogram", series.name, bins), lambda: histogram_bins(series, bins))
+
+
+# --------------------------- CORRELATION ENGINE ---------------------------
+CorrelationResult = namedtuple("CorrelationResult", ["r", "p", "n"])
+
+
+def _pairwise_pearson(values: np.ndarray, mask: np.ndarray):
+    """Pairwise-complete Pearson r and N for all column pairs at once."""
+    with np.errstate(invalid="ignore"):
+        center = np.nanmean(np.where(mask, values, np.nan), axis=0)
+    x = np.where(mask, values - np.nan_to_num(center), 0.0)
+    m = mask.astype(np.float64)
+    n = m.T @ m
+    sx = x.T @ m  # sx[i, j]: sum of column i over rows where i and j are both present
+    sxx = (x * x).T @ m
+    sxy = x.T @ x
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cov = sxy - sx * sx.T / n
+        var = sxx - sx * sx / n
+        r = cov / np.sqrt(var * var.T)
+    r = np.clip(r, -1.0, 1.0)
+    r[(n < 2) | ~(var > 0) | ~(var.T > 0)] = np.nan
+    return r, n
+
+
+# Spearman pairs whose columns have different missing rows need their own
+# ranking of the common rows. Each column is ranked once over all its values;
+# within a pair, the rank of a value drops by one for every row the partner
+# lacks that holds a smaller value (one half for an equal value). The shift is a
+# cumulative count over the column's sort order, so all partners of a column are
+# re-ranked together in integer arithmetic, with no per-pair sort.
+SPEARMAN_BATCH_CELLS = 4_000_000
+
+
+def _rank_positions(values: np.ndarray):
+    """First/last sorted position (1-based, 0 when missing) of each value's tie group.
+
+    values is columns x rows. lo + hi is twice the average rank, so the
+    re-ranking below stays in exact integer arithmetic.
+    """
+    n_rows = values.shape[1]
+    order = np.argsort(values, axis=1, kind="stable")
+    ordered = np.take_along_axis(values, order, axis=1)
+    pos = np.arange(n_rows)
+    first = np.ones(values.shape, dtype=bool)
+    first[:, 1:] = ordered[:, 1:] != ordered[:, :-1]
+    last = np.ones(values.shape, dtype=bool)
+    last[:, :-1] = first[:, 1:]
+    start = np.maximum.accumulate(np.where(first, pos, 0), axis=1)
+    end = np.minimum.accumulate(np.where(last, pos, n_rows - 1)[:, ::-1], axis=1)[:, ::-1]
+    missing = np.isnan(ordered)
+    lo = np.empty(values.shape, dtype=np.intp)
+    hi = np.empty(values.shape, dtype=np.intp)
+    np.put_along_axis(lo, order, np.where(missing, 0, start + 1), axis=1)
+    np.put_along_axis(hi, order, np.where(missing, 0, end + 1), axis=1)
+    return lo, hi
+
+
+def _dropped_below(n_cols: int, n_rows: int, owner: np.ndarray, lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+    """Per partner, twice the rank shift caused by its dropped rows, by sorted position.
+
+    Slot 0 stays 0, so missing values (position 0) are never shifted.
+    """
+    width = n_rows + 2
+    counts = np.bincount(np.concatenate([owner * width + lo, owner * width + hi + 1]), minlength=n_cols * width)
+    counts = counts.reshape(n_cols, width)
+    np.cumsum(counts, axis=1, out=counts)
+    counts[:, 0] = 0
+    return counts
+
+
+def _spearman_ragged(lo: np.ndarray, hi: np.ndarray, present: np.ndarray, ragged: np.ndarray, r: np.ndarray):
+    """Exact Spearman rho for the ragged pairs (upper triangle), written into r.
+
+    lo/hi come from _rank_positions; present is columns x rows like them.
+    """
+    n_cols, n_rows = lo.shape
+    twice = lo + hi
+    missing_rows = [np.flatnonzero(~present[j]) for j in range(n_cols)]
+    batch = max(1, SPEARMAN_BATCH_CELLS // max(n_rows, 1))
+    for i in range(n_cols):
+        partners = np.flatnonzero(ragged[i, i + 1 :]) + i + 1
+        for offset in range(0, len(partners), batch):
+            cols = partners[offset : offset + batch]
+            k = len(cols)
+            # rows a partner lacks but i has drop out of i's ranking
+            owner = np.repeat(np.arange(k), [len(missing_rows[j]) for j in cols])
+            rows = np.concatenate([missing_rows[j] for j in cols])
+            keep = present[i, rows]
+            owner, rows = owner[keep], rows[keep]
+            a = np.take(_dropped_below(k, n_rows, owner, lo[i, rows], hi[i, rows]), lo[i], axis=1)
+            np.subtract(twice[i], a, out=a)
+            a[owner, rows] = 0
+            m = present[i].sum() - np.bincount(owner, minlength=k)
+
+            # rows i lacks but a partner has drop out of that partner's ranking
+            owner, idx = np.nonzero(present[cols[:, None], missing_rows[i]])
+            rows = missing_rows[i][idx]
+            shift = _dropped_below(k, n_rows, owner, lo[cols[owner], rows], hi[cols[owner], rows])
+            b = np.empty_like(a)
+            for loc, j in enumerate(cols):
+                np.take(shift[loc], lo[j], out=b[loc])
+                np.subtract(twice[j], b[loc], out=b[loc])
+            b[owner, rows] = 0
+
+            # a and b hold twice the ranks within the common rows and 0 elsewhere
+            center = m * (m + 1) ** 2
+            sab = np.einsum("ij,ij->i", a, b) - center
+            saa = np.einsum("ij,ij->i", a, a) - center
+            sbb = np.einsum("ij,ij->i", b, b) - center
+            with np.errstate(divide="ignore", invalid="ignore"):
+                rho = sab / np.sqrt(saa.astype(np.float64) * sbb)
+            rho = np.clip(rho, -1.0, 1.0)
+            rho[m < 2] = np.nan
+            r[i, cols] = rho
+            r[cols, i] = rho
+
+
+def _p_values(r: np.ndarray, n: np.ndarray) -> np.ndarray:
+    df = n - 2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = r * np.sqrt(df / ((1.0 - r) * (1.0 + r)))
+        p = 2 * scipy_stats.t.sf(np.abs(t), df)
+    p[np.abs(r) >= 1.0] = 0.0
+    p[(df < 1) | np.isnan(r)] = np.nan
+    return p
+
+
+def correlation_matrices(num_df: pd.DataFrame, method: str = "pearson") -> CorrelationResult:
+    """Full r, p-value and pairwise-complete N matrices in one vectorized pass.
+
+    Spearman ranks every column once and correlates the ranks. Pairs whose
+    missing values differ (so the common rows need their own ranking) are
+    re-ranked exactly by _spearman_ragged, which keeps results identical to
+    scipy.stats.spearmanr on each pair's complete rows.
+    """
+    cols = list(num_df.columns)
+    data = num_df.apply(pd.to_numeric, errors="coerce")
+    mask = data.notna().to_numpy()
+    if method == "spearman":
+        lo, hi = _rank_positions(data.to_numpy(dtype=np.float64).T.copy())
+        values = np.where(mask, (lo + hi).T / 2.0, np.nan)
+    else:
+        values = data.to_numpy(dtype=np.float64)
+    r, n = _pairwise_pearson(values, mask)
+
+    if method == "spearman":
+        counts = mask.sum(axis=0)
+        ragged = (n != counts[:, None]) | (n != counts[None, :])
+        if np.triu(ragged, k=1).any():
+            _spearman_ragged(lo, hi, mask.T.copy(), ragged, r)
+
+    p = _p_values(r, n)
+    return CorrelationResult(
+        r=pd.DataFrame(r, index=cols, columns=cols),
+        p=pd.DataFrame(p, index=cols, columns=cols),
+        n=pd.DataFrame(n.astype(np.int64), index=cols, columns=cols),
+    )
+
+
+def cached_correlation(key, num_df: pd.DataFrame, method: str = "pearson") -> CorrelationResult:
+    """correlation_matrices from the analysis store, per (dataset/filter key, method, column set)."""
+    operation = ("correlation", method, tuple(num_df.columns))
+    return analysis_result(key, operation, lambda: correlation_matrices(num_df, method))
+
+
+def upper_pairs(result: CorrelationResult, min_n: int = 3):
+    """(col_a, col_b, r, p, n) for every pair above the diagonal with enough data."""
+    cols = list(result.r.columns)
+    r = result.r.to_numpy()
+    p = result.p.to_numpy()
+    n = result.n.to_numpy()
+    pairs = []
+    for i, j in zip(*np.triu_indices(len(cols), k=1)):
+        if n[i, j] >= min_n and not np.isnan(r[i, j]):
+            pairs.append((cols[i], cols[j], float(r[i, j]), float(p[i, j]), int(n[i, j])))
+    return pairs
+
+
+# --------------------------- CATEGORY CODES ---------------------------
+def factorize_levels(series: pd.Series):
+    """(codes, levels) with missing values as a level of their own (last).
+
+    Categorical columns reuse their stored integer codes instead of hashing
+    the values again.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy().astype(np.intp)
+        levels = pd.Index(series.cat.categories)
+        missing = codes < 0
+        if missing.any():
+            codes[missing] = len(levels)
+            levels = levels.append(pd.Index([np.nan], dtype=object))
+        return codes, levels
+    codes, uniques = pd.factorize(series, use_na_sentinel=False)
+    return codes.astype(np.intp, copy=False), pd.Index(uniques)
+
+
+def _contingency_frame(table: np.ndarray, rows: pd.Index, cols: pd.Index) -> pd.DataFrame:
+    """Counts over (row level, column level) shaped like pd.crosstab output."""
+    ok_r, ok_c = ~pd.isna(rows), ~pd.isna(cols)
+    ctab = pd.DataFrame(table[np.ix_(ok_r, ok_c)], index=rows[ok_r], columns=cols[ok_c])
+    ctab = ctab.loc[ctab.sum(axis=1) > 0, ctab.sum(axis=0) > 0]
+    return ctab.sort_index(axis=0).sort_index(axis=1)
+
+
+def crosstab_codes(x: pd.Series, y: pd.Series) -> pd.DataFrame:
+    """Same result as pd.crosstab(x, y) for two columns of one frame, via np.bincount on codes."""
+    x_codes, x_levels = factorize_levels(x)
+    y_codes, y_levels = factorize_levels(y)
+    nx, ny = len(x_levels), len(y_levels)
+    table = np.bincount(x_codes * ny + y_codes, minlength=nx * ny).reshape(nx, ny)
+    return _contingency_frame(table, x_levels.rename(x.name), y_levels.rename(y.name))
+
+
+def cached_crosstab(key, x: pd.Series, y: pd.Series, compute=None) -> pd.DataFrame:
+    """crosstab_codes(x, y) from the analysis store.
+
+    compute may supply a faster equivalent (e.g. FilterPartials.crosstab).
+    """
+    return analysis_result(key, ("crosstab", x.name, y.name), compute or (lambda: crosstab_codes(x, y)))
+
+
+def cached_value_counts(key, series: pd.Series, dropna: bool = True, normalize: bool = False, compute=None):
+    """series.value_counts(dropna=..., normalize=...) from one stored table per column.
+
+    The store keeps the dropna=False counts; compute may supply them faster
+    (e.g. from FilterPartials).
+    """
+    counts = analysis_result(
+        key,
+        ("value_counts", series.name),
+        compute or (lambda: series.value_counts(dropna=False)),
+    )
+    if dropna:
+        counts = counts[pd.notna(counts.index)]
+    if normalize:
+        counts = (counts / counts.sum()).rename("proportion")
+    return counts
+
+
+# --------------------------- ASSOCIATION SCREEN ---------------------------
+# Chi-square / Cramer's V for every pair of categorical columns. Each column
+# is factorized once; the contingency tables of a batch of pairs come from a
+# single np.bincount over "pair offset + code_a * levels_b + code_b", and the
+# statistics are computed for all cells of all pairs at once.
+ASSOCIATION_COLUMNS = ["var_a", "var_b", "n", "chi2", "dof", "p_value", "cramers_v"]
+ASSOCIATION_MAX_LEVELS = 50  # columns with more levels (names, free text) are skipped
+ASSOCIATION_BATCH_CELLS = 4_000_000  # row keys and table cells per chunk of pairs
+
+
+def _present_codes(series: pd.Series):
+    """(int32 codes, k): real levels are 0..k-1 and missing values are coded k."""
+    codes, levels = factorize_levels(series)
+    missing = pd.isna(levels)
+    k = int((~missing).sum())
+    if missing.any():
+        # the missing level is not always last (pd.factorize keeps appearance order)
+        remap = np.cumsum(~missing) - 1
+        remap[missing] = k
+        codes = remap[codes]
+    return codes.astype(np.int32), k
+
+
+def _association_chunk(codes: np.ndarray, pair_a: np.ndarray, pair_b: np.ndarray, n_levels: np.ndarray):
+    """(n, chi2, dof, p_value, cramers_v) arrays for the column pairs pair_a[i], pair_b[i]."""
+    n_pairs = len(pair_a)
+    # flat cell layout: pair p owns cells offset[p] .. offset[p] + la * lb
+    la, lb = n_levels[pair_a], n_levels[pair_b]
+    sizes = la * lb
+    offset = np.concatenate([[0], np.cumsum(sizes)])
+    # int64: la * lb of high-cardinality pairs does not fit the int32 codes
+    keys = codes[pair_a].astype(np.int64) * lb[:, None] + codes[pair_b]
+    keys += offset[:-1, None]
+    observed = np.bincount(keys.ravel(), minlength=offset[-1])
+    del keys
+
+    # per-cell pair id, row key and column key
+    pair = np.repeat(np.arange(n_pairs), sizes)
+    local = np.arange(offset[-1]) - offset[pair]
+    row, col = local // lb[pair], local % lb[pair]
+    observed[(row == la[pair] - 1) | (col == lb[pair] - 1)] = 0  # rows with a missing side
+    row_key = np.concatenate([[0], np.cumsum(la)])[pair] + row
+    col_key = np.concatenate([[0], np.cumsum(lb)])[pair] + col
+    row_tot = np.bincount(row_key, weights=observed, minlength=la.sum())
+    col_tot = np.bincount(col_key, weights=observed, minlength=lb.sum())
+    n = np.bincount(pair, weights=observed, minlength=n_pairs)
+
+    # levels never seen in a pair drop out, like in pd.crosstab
+    rows_used = np.bincount(np.repeat(np.arange(n_pairs), la), weights=row_tot > 0, minlength=n_pairs)
+    cols_used = np.bincount(np.repeat(np.arange(n_pairs), lb), weights=col_tot > 0, minlength=n_pairs)
+    valid = (rows_used > 1) & (cols_used > 1)
+    dof = np.where(valid, (rows_used - 1) * (cols_used - 1), 0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        expected = row_tot[row_key] * col_tot[col_key] / n[pair]
+        used = expected > 0
+        diff = observed - expected
+        chi2_raw = np.bincount(pair[used], weights=diff[used] ** 2 / expected[used], minlength=n_pairs)
+        # Yates: |O - E| shrinks by up to 0.5 for 2x2 tables, as in chi2_contingency
+        yates = used & (dof[pair] == 1)
+        shrunk = np.abs(diff[yates]) - np.minimum(0.5, np.abs(diff[yates]))
+        chi2 = chi2_raw.copy()
+        chi2[dof == 1] = 0.0
+        chi2 += np.bincount(pair[yates], weights=shrunk**2 / expected[yates], minlength=n_pairs)
+        cramers_v = np.sqrt(chi2_raw / (n * np.minimum(rows_used - 1, cols_used - 1)))
+    chi2[~valid] = np.nan
+    cramers_v[~valid] = np.nan
+    p_value = np.full(n_pairs, np.nan)
+    p_value[valid] = scipy_stats.chi2.sf(chi2[valid], dof[valid])
+    return n, chi2, dof, p_value, cramers_v
+
+
+def association_screen(cat_df: pd.DataFrame, max_levels: int = ASSOCIATION_MAX_LEVELS) -> pd.DataFrame:
+    """Ranked chi-square screen over all column pairs (strongest Cramer's V first).
+
+    chi2, dof and p_value equal scipy.stats.chi2_contingency on
+    pd.crosstab(a, b) (Yates' correction when dof == 1); cramers_v uses the
+    uncorrected statistic. Pairs with fewer than two observed levels on a
+    side get NaN statistics and are ranked last.
+    """
+    cols, codes, n_levels = [], [], []
+    for col in cat_df.columns:
+        col_codes, k = _present_codes(cat_df[col])
+        if 0 < k <= max_levels:
+            cols.append(col)
+            codes.append(col_codes)
+            n_levels.append(k)
+    if len(cols) < 2:
+        return pd.DataFrame(columns=ASSOCIATION_COLUMNS)
+    codes = np.stack(codes)  # one row per column: pair gathers stay contiguous
+    # one spare level per column collects its missing values
+    n_levels = np.asarray(n_levels, dtype=np.int64) + 1
+    pair_a, pair_b = np.triu_indices(len(cols), k=1)
+    n_pairs = len(pair_a)
+
+    # pairs go in chunks so that neither the row keys (rows x pairs) nor the
+    # cell arrays (sum of la x lb) of one chunk exceed ASSOCIATION_BATCH_CELLS
+    cost = np.concatenate([[0], np.cumsum(codes.shape[1] + n_levels[pair_a] * n_levels[pair_b])])
+    stats = np.empty((5, n_pairs))
+    start = 0
+    while start < n_pairs:
+        stop = int(np.searchsorted(cost, cost[start] + ASSOCIATION_BATCH_CELLS, side="right")) - 1
+        stop = min(max(stop, start + 1), n_pairs)
+        stats[:, start:stop] = _association_chunk(codes, pair_a[start:stop], pair_b[start:stop], n_levels)
+        start = stop
+    n, chi2, dof, p_value, cramers_v = stats
+
+    names = np.asarray(cols, dtype=object)
+    screen = pd.DataFrame(
+        {
+            "var_a": names[pair_a],
+            "var_b": names[pair_b],
+            "n": n.astype(np.int64),
+            "chi2": chi2,
+            "dof": dof.astype(np.int64),
+            "p_value": p_value,
+            "cramers_v": np.minimum(cramers_v, 1.0),
+        }
+    )
+    screen = screen.sort_values(["cramers_v", "p_value"], ascending=[False, True], na_position="last", kind="stable")
+    return screen.reset_index(drop=True)
+
+
+def cached_association_screen(key, cat_df: pd.DataFrame) -> pd.DataFrame:
+    """association_screen from the analysis store, per (dataset/filter key, column set)."""
+    return analysis_result(key, ("association", tuple(cat_df.columns)), lambda: association_screen(cat_df))
+
+
+# --------------------------- FILTER PARTIALS ---------------------------
+# A contingency partial holds groups x levels x levels counts; past this many
+# cells the crosstab is counted from the selected rows instead of kept.
+CROSSTAB_PARTIAL_MAX_CELLS = 1_000_000
+
+
+class FilterPartials:
+    """Per-category partial aggregates of a frame, grouped by one filter column.
+
+    Each statistic is computed once per column as one row per filter value
+    (counts, sums, centered sums of squares, min/max, histogram bins, value
+    and contingency counts). Toggling the selected filter values only
+    combines those small arrays instead of rescanning the rows.
+
+    The object itself only keeps the filter codes. Every partial is a
+    separate entry in the analysis store under (key, None), so each one is
+    sized and evicted on its own; methods take the column (a Series of the
+    unfiltered frame) instead of holding on to the frame.
+    """
+
+    def __init__(self, key, df: pd.DataFrame, by: str = None, bins: int = 20):
+        self.key = key
+        self.by = by
+        self.bins = bins
+        if by is None:
+            self.codes = np.zeros(len(df), dtype=np.intp)
+            self.groups = pd.Index([None])
+        else:
+            self.codes, self.groups = factorize_levels(df[by])
+        self.n_groups = len(self.groups)
+
+    def __sizeof__(self) -> int:
+        return object.__sizeof__(self) + self.codes.nbytes + self.groups.memory_usage(deep=True)
+
+    def select(self, values=None) -> np.ndarray:
+        """Boolean mask over groups; None selects every row (no filter)."""
+        if values is None or self.by is None:
+            return np.ones(self.n_groups, dtype=bool)
+        return np.asarray(self.groups.isin(list(values)))
+
+    def row_mask(self, selection) -> np.ndarray:
+        """Row-level boolean mask for a group selection (a lookup on the codes)."""
+        return selection[self.codes]
+
+    def _part(self, operation: tuple, compute):
+        data_key = None if self.key is None else (self.key, None)
+        return analysis_result(data_key, ("partials", self.by) + operation, compute)
+
+    # ---- numeric moments ----
+    def _numeric(self, series: pd.Series):
+        def compute():
+            x = pd.to_numeric(series, errors="coerce").to_numpy(dtype=np.float64)
+            ok = ~np.isnan(x)
+            codes, x = self.codes[ok], x[ok]
+            count = np.bincount(codes, minlength=self.n_groups).astype(np.float64)
+            total = np.bincount(codes, weights=x, minlength=self.n_groups)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                mean = total / count
+            dev = x - mean[codes]
+            m2 = np.bincount(codes, weights=dev * dev, minlength=self.n_groups)
+            grouped = pd.Series(x).groupby(codes)
+            mn = grouped.min().reindex(range(self.n_groups)).to_numpy()
+            mx = grouped.max().reindex(range(self.n_groups)).to_numpy()
+            return {"count": count, "sum": total, "mean": mean, "m2": m2, "min": mn, "max": mx}
+
+        return self._part(("numeric", series.name), compute)
+
+    def numeric_summary(self, series: pd.Series, selection) -> dict:
+        part = self._numeric(series)
+        sel = selection & (part["count"] > 0)
+        n = part["count"][sel].sum()
+        if n == 0:
+            return {"count": 0, "sum": 0.0, "mean": np.nan, "std": np.nan, "min": np.nan, "max": np.nan}
+        total = part["sum"][sel].sum()
+        mean = total / n
+        # parallel (Chan et al.) combination of the per-group centered sums of squares
+        m2 = (part["m2"][sel] + part["count"][sel] * (part["mean"][sel] - mean) ** 2).sum()
+        return {
+            "count": int(n),
+            "sum": float(total),
+            "mean": float(mean),
+            "std": float(np.sqrt(m2 / (n - 1))) if n > 1 else np.nan,
+            "min": float(part["min"][sel].min()),
+            "max": float(part["max"][sel].max()),
+        }
+
+    # ---- histogram bins ----
+    def _histogram(self, series: pd.Series):
+        def compute():
+            x = pd.to_numeric(series, errors="coerce").to_numpy(dtype=np.float64)
+            ok = ~np.isnan(x)
+            codes, x = self.codes[ok], x[ok]
+            if x.size == 0:
+                edges = np.linspace(0.0, 1.0, self.bins + 1)
+                return {"counts": np.zeros((self.n_groups, self.bins), dtype=np.int64), "edges": edges}
+            edges = np.histogram_bin_edges(x, bins=self.bins)
+            idx = np.clip(np.searchsorted(edges, x, side="right") - 1, 0, self.bins - 1)
+            flat = np.bincount(codes * self.bins + idx, minlength=self.n_groups * self.bins)
+            return {"counts": flat.reshape(self.n_groups, self.bins), "edges": edges}
+
+        return self._part(("histogram", series.name, self.bins), compute)
+
+    def histogram(self, series: pd.Series, selection):
+        part = self._histogram(series)
+        return part["counts"][selection].sum(axis=0), part["edges"]
+
+    # ---- value / contingency counts ----
+    def _value_counts(self, series: pd.Series):
+        def compute():
+            # the row-length level codes are only needed while counting
+            codes, levels = factorize_levels(series)
+            n_levels = len(levels)
+            flat = np.bincount(self.codes * n_levels + codes, minlength=self.n_groups * n_levels)
+            return {"counts": flat.reshape(self.n_groups, n_levels), "levels": levels}
+
+        return self._part(("value_counts", series.name), compute)
+
+    def value_counts(self, series: pd.Series, selection, dropna: bool = True, normalize: bool = False) -> pd.Series:
+        """Same result as filtered_df[col].value_counts(...), from cached partials."""
+        part = self._value_counts(series)
+        levels = part["levels"]
+        counts = part["counts"][selection].sum(axis=0)
+        keep = counts > 0
+        if dropna:
+            keep &= ~pd.isna(levels)
+        counts, levels = counts[keep], levels[keep]
+        order = np.argsort(-counts, kind="stable")
+        out = pd.Series(counts[order], index=pd.Index(levels[order], name=series.name), name="count")
+        if normalize:
+            out = (out / out.sum()).rename("proportion")
+        return out
+
+    def crosstab(self, x: pd.Series, y: pd.Series, selection) -> pd.DataFrame:
+        """Same result as pd.crosstab(filtered_df[x.name], filtered_df[y.name])."""
+        x_levels, y_levels = self._value_counts(x)["levels"], self._value_counts(y)["levels"]
+        nx, ny = len(x_levels), len(y_levels)
+        if self.n_groups * nx * ny > CROSSTAB_PARTIAL_MAX_CELLS:
+            rows = self.row_mask(selection)
+            return crosstab_codes(x[rows], y[rows])
+
+        def compute():
+            x_codes, _ = factorize_levels(x)
+            y_codes, _ = factorize_levels(y)
+            flat = np.bincount((self.codes * nx + x_codes) * ny + y_codes, minlength=self.n_groups * nx * ny)
+            return flat.reshape(self.n_groups, nx, ny)
+
+        table = self._part(("crosstab", x.name, y.name), compute)[selection].sum(axis=0)
+        return _contingency_frame(table, x_levels.rename(x.name), y_levels.rename(y.name))
+
+
+def filter_partials(key, df: pd.DataFrame, by: str = None) -> FilterPartials:
+    """FilterPartials for (dataset key, filter column), shared across reruns and sessions."""
+    return analysis_result((key, None), ("partials", by), lambda: FilterPartials(key, df, by))
@@ -0,0 +1,114 @@
+import functools
+import heapq
+import os
+import string
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from survey_cache import analysis_result
+from survey_lazy import nltk_corpus
+
+PUNCTUATION_TABLE = str.maketrans("", "", string.punctuation)
+
+# --------------------------- STOPWORDS ---------------------------
+# Bundled lists (one word per line) so nothing is imported or downloaded at
+# startup and the text tab works offline. english.txt is NLTK's English list.
+# Other languages fall back to an already installed NLTK corpus, never a
+# download.
+STOPWORDS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "stopwords")
+
+# bahasa UI -> bahasa stopword yang dibuang dari jawaban teks
+STOPWORD_LANGUAGES = {"ID": ("english", "indonesian")}
+
+
+@functools.lru_cache(maxsize=None)
+def _load_stopwords(language: str) -> frozenset:
+    path = os.path.join(STOPWORDS_DIR, f"{language}.txt")
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            return frozenset(f.read().split())
+    try:
+        return frozenset(nltk_corpus.stopwords.words(language))
+    except (ImportError, LookupError, OSError):
+        return frozenset()
+
+
+@functools.lru_cache(maxsize=None)
+def stopword_set(language="english") -> frozenset:
+    """Stopwords of a language, or the union for a tuple of languages; loaded on first use."""
+    if isinstance(language, str):
+        return _load_stopwords(language)
+    return frozenset().union(*(_load_stopwords(lang) for lang in language))
+
+
+def stopword_languages(ui_language: str):
+    """Stopword language(s) used for text answers under a UI language."""
+    return STOPWORD_LANGUAGES.get(ui_language, "english")
+
+
+# --------------------------- TEXT PREPROCESSING ---------------------------
+# The column is cleaned as one joined string (one lower() and one translate()
+# instead of one per answer) and split at C speed; only the stopword/alpha
+# filter stays per token.
+_ROW_SEP = "\x00"
+
+
+def _clean_rows(texts: list) -> list:
+    """Lowercased, punctuation-free version of each text."""
+    joined = _ROW_SEP.join(texts)
+    if joined.count(_ROW_SEP) != max(len(texts) - 1, 0):
+        # separator muncul di dalam teks: bersihkan per baris
+        return [t.lower().translate(PUNCTUATION_TABLE) for t in texts]
+    return joined.lower().translate(PUNCTUATION_TABLE).split(_ROW_SEP)
+
+
+def preprocess_text_series(series: pd.Series, language: str = "english") -> pd.Series:
+    """Token list per row: lowercase, no punctuation, split on spaces, stopwords removed."""
+    stop = stopword_set(language)
+    present = series.notna().to_numpy()
+    cleaned = iter(_clean_rows(series[present].astype(str).tolist()))
+    rows = [
+        [t for t in next(cleaned).split() if t.isalpha() and t not in stop] if ok else []
+        for ok in present
+    ]
+    return pd.Series(rows, index=series.index, name=series.name, dtype=object)
+
+
+def token_counts(series: pd.Series, language: str = "english") -> pd.Series:
+    """Word -> frequency over a whole column, same tokens as preprocess_text_series.
+
+    Categorical columns tokenize each category once and weight it by its
+    count; the alphabetic/stopword filter runs on the vocabulary only.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        answers = series.value_counts(sort=False)
+        answers = answers[answers > 0]
+        counter = Counter()
+        for text, n in zip(_clean_rows(answers.index.astype(str).tolist()), answers.to_numpy()):
+            for token, k in Counter(text.split()).items():
+                counter[token] += k * int(n)
+    else:
+        texts = series.dropna().astype(str).tolist()
+        counter = Counter(" ".join(_clean_rows(texts)).split())
+    stop = stopword_set(language)
+    words = [w for w in counter if w.isalpha() and w not in stop]
+    return pd.Series(
+        [counter[w] for w in words],
+        index=pd.Index(words, dtype=object, name="word"),
+        dtype=np.int64,
+        name="count",
+    )
+
+
+def cached_token_counts(key, series: pd.Series, language: str = "english") -> pd.Series:
+    """token_counts from the analysis store, per (dataset/filter key, column, language)."""
+    return analysis_result(key, ("token_counts", series.name, language), lambda: token_counts(series, language))
+
+
+def top_words(counts: pd.Series, n: int = 10):
+    """[(word, count), ...] of the n most frequent words, picked with a heap."""
+    values = counts.to_numpy()
+    best = heapq.nlargest(n, range(len(values)), key=values.__getitem__)
+    return [(counts.index[i], int(values[i])) for i in best]
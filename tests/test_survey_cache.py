@@ -0,0 +1,120 @@
+import types
+
+import numpy as np
+import pytest
+
+import survey_cache
+from survey_cache import ANALYSIS_STORE, CACHES, SESSION_EXPIRE_SECONDS, SessionRegistry
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A monotonic clock the test moves by hand."""
+    now = [1000.0]
+    monkeypatch.setattr(survey_cache, "time", types.SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+
+@pytest.fixture(autouse=True)
+def empty_caches():
+    for cache in CACHES.values():
+        cache.clear()
+    yield
+    for cache in CACHES.values():
+        cache.clear()
+
+
+def _store(dataset, operation, nbytes: int):
+    ANALYSIS_STORE.put(((dataset, None), operation), np.zeros(nbytes, dtype=np.uint8))
+
+
+def test_footprint_splits_private_and_shared_bytes(clock):
+    sessions = SessionRegistry(budget_bytes=10**9, idle_seconds=60)
+    _store("fp-a", ("describe",), 1000)
+    _store("fp-a", ("corr", "pearson"), 500)
+    _store("fp-b", ("describe",), 4000)
+    sessions.touch("s1", "fp-a", private={"upload": 300})
+    sessions.touch("s2", "fp-a", private={"upload": 200})
+    sessions.touch("s3", "fp-b")
+
+    usage = sessions.footprint("s1")
+    assert usage["private"] == {"upload": 300}
+    assert usage["shared"]["analysis"] == 1500
+    assert usage["sharing_sessions"] == 2
+    assert sessions.footprint("unknown") == {"private": {}, "shared": {}, "sharing_sessions": 0}
+    assert sessions.total_bytes() == 300 + 200 + 5500
+
+
+def test_nothing_is_released_under_budget(clock):
+    released = []
+    sessions = SessionRegistry(budget_bytes=10**9, idle_seconds=60)
+    _store("fp-a", ("describe",), 1000)
+    sessions.touch("old", "fp-a", private={"pdf_export": 100}, release={"pdf_export": lambda: released.append("old")})
+    clock[0] += 120
+    assert sessions.touch("new", "fp-b") == 0
+    assert released == [] and (("fp-a", None), ("describe",)) in ANALYSIS_STORE
+    assert sessions.stats()["idle_sessions"] == 1
+
+
+def test_idle_session_is_released_when_over_budget(clock):
+    released = []
+    sessions = SessionRegistry(budget_bytes=2000, idle_seconds=60)
+    _store("fp-a", ("describe",), 1000)
+    release = {"pdf_export": lambda: released.append("old")}
+    sessions.touch("old", "fp-a", private={"upload": 50, "pdf_export": 100}, release=release)
+    clock[0] += 120
+    _store("fp-b", ("describe",), 1500)
+    freed = sessions.touch("new", "fp-b")
+
+    assert released == ["old"]
+    assert freed == 1000 + 100
+    assert sessions.footprint("old")["private"] == {"upload": 50}
+    assert sessions.footprint("old")["shared"]["analysis"] == 0
+    assert sessions.footprint("new")["shared"]["analysis"] == 1500
+    stats = sessions.stats()
+    assert stats["releases"] == 1 and stats["released_bytes"] == 1100
+
+    # a released session is not released again until it reruns
+    clock[0] += 120
+    sessions.budget_bytes = 0
+    assert sessions.enforce_budget() == 1500  # now "new" is idle too
+    assert released == ["old"]
+
+
+def test_dataset_open_in_an_active_session_is_kept(clock):
+    released = []
+    sessions = SessionRegistry(budget_bytes=500, idle_seconds=60)
+    _store("fp-a", ("describe",), 1000)
+    sessions.touch("old", "fp-a", release={"pdf_export": lambda: released.append("old")})
+    clock[0] += 120
+    sessions.touch("new", "fp-a")
+
+    # the idle session still gives up its own bytes, the shared dataset stays
+    assert released == ["old"]
+    assert sessions.footprint("new")["shared"]["analysis"] == 1000
+    assert sessions.stats()["releases"] == 1
+
+
+def test_failing_release_hook_keeps_its_bytes(clock):
+    def broken():
+        raise OSError("disk full")
+
+    sessions = SessionRegistry(budget_bytes=0, idle_seconds=60)
+    sessions.touch("old", private={"pdf_export": 100}, release={"pdf_export": broken})
+    clock[0] += 120
+    assert sessions.touch("new") == 0
+    assert sessions.footprint("old")["private"] == {"pdf_export": 100}
+
+
+def test_expired_sessions_are_forgotten_over_budget(clock):
+    sessions = SessionRegistry(budget_bytes=0, idle_seconds=60)
+    sessions.touch("gone", "fp-a", private={"upload": 100})
+    clock[0] += 120
+    sessions.touch("idle", "fp-b")
+    assert sessions.stats()["sessions"] == 2
+
+    clock[0] += SESSION_EXPIRE_SECONDS + 1
+    sessions.touch("new")
+    assert sessions.stats()["sessions"] == 1
+    assert sessions.footprint("gone")["sharing_sessions"] == 0
+    assert sessions.total_bytes() == 0
@@ -0,0 +1,28 @@
+from concurrent.futures import CancelledError
+
+import numpy as np
+import pandas as pd
+
+import survey_charts
+from survey_charts import render_charts, report_bar
+
+
+class _CancelledPool:
+    def map(self, fn, jobs):
+        raise CancelledError()
+
+
+def test_render_charts_falls_back_when_the_pool_was_cancelled(monkeypatch):
+    monkeypatch.setattr(survey_charts, "_chart_pool", lambda workers: _CancelledPool())
+    monkeypatch.setattr(survey_charts, "_reset_chart_pool", lambda: None)
+    freq = pd.Series([3, 5], index=["a", "b"])
+    images = render_charts([(report_bar, ("q1", freq)), (report_bar, ("q2", freq))], workers=2)
+    assert len(images) == 2 and all(png.startswith(b"\x89PNG") for png in images)
+
+
+def test_report_charts_do_not_touch_pyplot():
+    plt = survey_charts.plt
+    before = plt.get_fignums()
+    fig = report_bar("q1", pd.Series(np.arange(1, 4), index=["a", "b", "c"]))
+    assert plt.get_fignums() == before
+    assert survey_charts.figure_bytes(fig).startswith(b"\x89PNG")
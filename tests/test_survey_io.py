@@ -0,0 +1,64 @@
+import io
+
+import numpy as np
+import pandas as pd
+
+from survey_io import load_survey, read_csv_streaming
+
+
+def _upload(text: str, name: str = "survey.csv") -> io.BytesIO:
+    upload = io.BytesIO(text.encode("utf-8"))
+    upload.name = name
+    return upload
+
+
+def _survey_csv(rows: int = 1000) -> str:
+    lines = ["id,gender,optional,postcode,score"]
+    for i in range(rows):
+        gender = "F" if i % 3 else "M"
+        # an optional answer nobody gave after row 600: the last chunk is all blank
+        optional = ("Yes", "No", "Maybe")[i % 3] if i < 600 else ""
+        # numeric until row 700, then text; the leading zero must survive
+        postcode = f"0{i % 9}1" if i < 700 else f"A{i % 9}"
+        lines.append(f"{i},{gender},{optional},{postcode},{i % 5 + 1}")
+    return "\n".join(lines) + "\n"
+
+
+def test_streaming_survives_blank_chunk_in_category_column():
+    text = _survey_csv()
+    df = load_survey(_upload(text), stream=True, chunksize=400)
+    assert df is not None
+    expected = pd.read_csv(io.StringIO(text))
+    assert isinstance(df["optional"].dtype, pd.CategoricalDtype)
+    assert sorted(df["optional"].cat.categories) == ["Maybe", "No", "Yes"]
+    assert df["optional"].isna().sum() == 400
+    pd.testing.assert_series_equal(df["optional"].astype(object), expected["optional"].astype(object))
+
+
+def test_streaming_reparses_column_that_turns_to_text():
+    text = _survey_csv()
+    frame, report = read_csv_streaming(io.StringIO(text), chunksize=400)
+    expected = pd.read_csv(io.StringIO(text))
+    assert report["rows"] == 1000 and report["chunks"] == 3
+    values = frame["postcode"].astype(object)
+    assert values[5] == "051" and values[900] == "A0"
+    assert all(isinstance(v, str) for v in values)
+    pd.testing.assert_series_equal(values, expected["postcode"].astype(object))
+    np.testing.assert_array_equal(frame["score"].to_numpy(), expected["score"].to_numpy())
+
+
+def test_streaming_keeps_large_ids_with_gaps_exact():
+    lines = ["respondent_id,amount,likert"]
+    for i in range(1000):
+        # 10-digit IDs, most of them missing; float32 would round them to a multiple of 512 or more
+        respondent_id = str(6281234567 + 7 * i) if i % 4 == 0 else ""
+        likert = str(i % 5 + 1) if i % 10 else ""
+        lines.append(f"{respondent_id},{123456789.25 + i},{likert}")
+    text = "\n".join(lines) + "\n"
+    frame, _ = read_csv_streaming(io.StringIO(text), chunksize=300)
+    expected = pd.read_csv(io.StringIO(text))
+    for col in ("respondent_id", "amount", "likert"):
+        np.testing.assert_array_equal(frame[col].to_numpy(dtype=np.float64), expected[col].to_numpy(dtype=np.float64))
+    assert frame["respondent_id"].iloc[0] == 6281234567
+    # small values still get the compact dtype
+    assert frame["likert"].dtype == np.float32
@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+from survey_charts import scatter_payload
+from survey_pdf_charts import _clip_line, vector_scatter
+
+
+@pytest.mark.parametrize("slope", [3.0, -3.0, 0.5])
+def test_trend_segment_is_cut_at_the_box_and_keeps_its_slope(slope):
+    xs, ys = _clip_line(slope, 1.0, (0.0, 10.0), (0.0, 8.0))
+    assert np.all((ys >= 0.0) & (ys <= 8.0)) and np.all((xs >= 0.0) & (xs <= 10.0))
+    assert (ys[1] - ys[0]) / (xs[1] - xs[0]) == pytest.approx(slope)
+    np.testing.assert_allclose(ys, slope * xs + 1.0)
+
+
+def test_trend_segment_outside_the_box_is_dropped():
+    assert _clip_line(0.0, 20.0, (0.0, 10.0), (0.0, 8.0)) is None
+    assert _clip_line(1.0, -50.0, (0.0, 10.0), (0.0, 8.0)) is None
+    xs, ys = _clip_line(0.0, 4.0, (0.0, 10.0), (0.0, 8.0))
+    np.testing.assert_array_equal(xs, [0.0, 10.0])
+    np.testing.assert_array_equal(ys, [4.0, 4.0])
+
+
+def test_vector_scatter_draws_with_a_steep_trend():
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=200)
+    y = 5 * x + rng.normal(scale=10, size=200)
+    drawing = vector_scatter("x", "y", scatter_payload(x, y))
+    assert drawing.width > 0
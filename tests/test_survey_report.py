@@ -0,0 +1,126 @@
+import io
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import survey_report
+from survey_cache import SessionRegistry
+from survey_report import ExportJob, ExportQueue, ExportQueueFull, ReportArtifact
+
+
+def _artifact(content: bytes, max_memory_mb: float) -> ReportArtifact:
+    artifact = ReportArtifact("report.pdf", max_memory_mb=max_memory_mb)
+    artifact.file.write(content)
+    return artifact
+
+
+def test_artifact_tracks_rollover_and_spill():
+    small = _artifact(b"%PDF" + b"x" * 100, max_memory_mb=1)
+    assert small.size == 104 and not small.on_disk
+    small.spill()
+    assert small.on_disk
+    large = _artifact(b"x" * 2048, max_memory_mb=1 / 1024)
+    assert large.on_disk
+    small.close()
+    large.close()
+
+
+def test_artifact_reader_streams_content():
+    content = bytes(range(256)) * 1000
+    artifact = _artifact(content, max_memory_mb=1 / 64)
+    reader = artifact.open()
+    assert isinstance(reader, io.RawIOBase)
+    assert reader.read(10) == content[:10]
+    assert reader.read() == content[10:]
+    reader.seek(-6, os.SEEK_END)
+    assert reader.read() == content[-6:]
+    # two readers keep their own position
+    first, second = artifact.open(), artifact.open()
+    first.read(100)
+    assert second.read(4) == content[:4]
+    # what Streamlit does with a file object returned by a deferred download
+    second.seek(0)
+    assert second.read() == content
+    artifact.close()
+
+
+def test_closed_artifact_reads_as_empty(caplog):
+    artifact = _artifact(b"%PDF-1.4", max_memory_mb=1)
+    reader = artifact.open()
+    assert reader.read(4) == b"%PDF"
+    # a new export (or the release path) closed it while its download button was still shown
+    artifact.close()
+    assert artifact.closed and artifact.size == 0
+    assert reader.read() == b""
+    assert artifact.open().read() == b""
+    assert "after it was closed" in caplog.text
+
+
+def _survey(rows: int = 60) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({"score": rng.normal(size=rows), "group": rng.choice(["a", "b"], rows)})
+
+
+def _submit(queue: ExportQueue, owner, **kwargs) -> ExportJob:
+    return queue.submit(owner, "report.pdf", _survey(), ["score"], ["group"], [], **kwargs)
+
+
+def test_export_job_runs_to_done():
+    queue = ExportQueue(workers=1, max_jobs=2)
+    job = _submit(queue, "session-a", charts="vector")
+    job.future.result(timeout=120)
+    assert job.state == "done" and job.error is None
+    assert job.fraction == 1.0
+    assert job.artifact.open().read(5) == b"%PDF-"
+    assert queue.stats()["queued"] == queue.stats()["running"] == 0
+    job.close()
+    assert job.artifact.file.closed
+
+
+def test_export_job_failure_is_reported():
+    queue = ExportQueue(workers=1, max_jobs=2)
+    job = _submit(queue, "session-a", charts="no-such-mode")
+    job.future.result(timeout=120)
+    assert job.state == "failed"
+    assert isinstance(job.error, ValueError)
+    assert job.artifact.file.closed
+
+
+def test_queued_job_is_cancelled_when_its_session_is_released(monkeypatch):
+    started, unblock = threading.Event(), threading.Event()
+
+    def slow_build(*args, output=None, progress=None, **kwargs):
+        started.set()
+        unblock.wait(30)
+        output.write(b"%PDF-1.4")
+
+    monkeypatch.setattr(survey_report, "build_survey_report_pdf", slow_build)
+    queue = ExportQueue(workers=1, max_jobs=2)
+    running = _submit(queue, "session-a")
+    assert started.wait(30)
+    queued = _submit(queue, "session-b")
+    assert queued.state == "queued" and queue.position(queued) == 0
+    assert _submit(queue, "session-b") is queued  # one job per session
+    with pytest.raises(ExportQueueFull):
+        _submit(queue, "session-c")
+
+    # session-b went idle with the server over budget: its release hook runs
+    sessions = SessionRegistry(budget_bytes=0, idle_seconds=-1)
+    sessions.touch("session-b", private={"upload": 1}, release={"pdf_export": queued.close})
+    assert queued.state == "cancelled"
+    assert queued.finished  # the panel shows the cancelled notice and the button is enabled again
+    assert queued.artifact.file.closed
+    assert queue.stats() == {"queued": 0, "running": 1, "workers": 1, "max_jobs": 2}
+    # coming back, the session can queue a new export
+    again = _submit(queue, "session-b")
+    assert again is not queued and again.state == "queued"
+
+    unblock.set()
+    running.future.result(timeout=30)
+    assert running.state == "done"
+    assert running.artifact.open().read() == b"%PDF-1.4"
+    again.future.result(timeout=30)
+    assert again.state == "done"
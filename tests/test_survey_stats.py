@@ -0,0 +1,133 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats as scipy_stats
+
+from survey_cache import ANALYSIS_STORE
+import survey_stats
+from survey_stats import association_screen, correlation_matrices, filter_partials
+
+
+def _pairwise_reference(df: pd.DataFrame, method: str) -> np.ndarray:
+    cols = list(df.columns)
+    ref = np.full((len(cols), len(cols)), np.nan)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        for i, a in enumerate(cols):
+            for j, b in enumerate(cols[:i]):
+                both = df[[a, b]].dropna()
+                if len(both) < 2:
+                    continue
+                test = scipy_stats.spearmanr if method == "spearman" else scipy_stats.pearsonr
+                ref[i, j] = ref[j, i] = test(both[a], both[b])[0]
+    return ref
+
+
+def _survey_frame(rows: int, missing: dict, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    base = rng.normal(size=rows)
+    df = pd.DataFrame(
+        {
+            "likert": np.clip(np.round(base * 1.2 + 3), 1, 5),
+            "score": np.round(base + rng.normal(size=rows), 1),
+            "age": rng.integers(18, 70, rows).astype(float),
+            "rating": rng.integers(1, 11, rows).astype(float),
+            "constant": np.full(rows, 4.0),
+        }
+    )
+    for col, share in missing.items():
+        df.loc[rng.choice(rows, int(rows * share), replace=False), col] = np.nan
+    return df
+
+
+@pytest.mark.parametrize(
+    "missing",
+    [
+        {},
+        {"score": 0.05},
+        # NaN-heavy: most pairs need their own re-ranking, some share almost no rows
+        {"likert": 0.6, "score": 0.85, "age": 0.3, "rating": 0.97, "constant": 0.5},
+    ],
+)
+@pytest.mark.parametrize("method", ["pearson", "spearman"])
+def test_correlation_matches_scipy_per_pair(method, missing):
+    df = _survey_frame(400, missing)
+    result = correlation_matrices(df, method)
+    ref = _pairwise_reference(df, method)
+    off_diagonal = ~np.eye(len(df.columns), dtype=bool)
+    r = result.r.to_numpy()[off_diagonal]
+    np.testing.assert_array_equal(np.isnan(r), np.isnan(ref[off_diagonal]))
+    np.testing.assert_allclose(r, ref[off_diagonal], rtol=0, atol=1e-12, equal_nan=True)
+    expected_n = [[df[[a, b]].notna().all(axis=1).sum() for b in df.columns] for a in df.columns]
+    np.testing.assert_array_equal(result.n.to_numpy(), expected_n)
+
+
+def test_spearman_pair_without_common_rows_is_nan():
+    df = pd.DataFrame({"a": [1.0, 2.0, 3.0, np.nan, np.nan], "b": [np.nan, np.nan, np.nan, 1.0, 2.0]})
+    result = correlation_matrices(df, "spearman")
+    assert np.isnan(result.r.loc["a", "b"])
+    assert result.n.loc["a", "b"] == 0
+
+
+def test_filter_partials_match_filtered_frame_and_are_stored_separately():
+    rng = np.random.default_rng(3)
+    df = pd.DataFrame(
+        {
+            "region": rng.choice(["north", "south", "east", None], 600),
+            "gender": pd.Categorical(rng.choice(["f", "m", None], 600)),
+            "income": np.where(rng.random(600) < 0.1, np.nan, rng.normal(50, 10, 600)),
+        }
+    )
+    key = ("test-partials", len(df))
+    partials = filter_partials(key, df, "region")
+    selection = partials.select(["north", "east"])
+    sub = df[df["region"].isin(["north", "east"])]
+
+    summary = partials.numeric_summary(df["income"], selection)
+    assert summary["count"] == sub["income"].count()
+    assert summary["std"] == pytest.approx(sub["income"].std())
+    counts = partials.value_counts(df["gender"], selection, dropna=False)
+    expected = sub["gender"].value_counts(dropna=False)
+    pd.testing.assert_series_equal(
+        counts.sort_index(), expected.sort_index(), check_index_type=False, check_categorical=False
+    )
+    pd.testing.assert_frame_equal(
+        partials.crosstab(df["gender"], df["region"], selection),
+        pd.crosstab(sub["gender"], sub["region"]),
+        check_dtype=False,
+        check_categorical=False,
+        check_index_type=False,
+    )
+
+    # the shared object keeps no frame; each partial is its own sized entry
+    assert not any(value is df for value in vars(partials).values())
+    entries = [k for k in ANALYSIS_STORE._data if k[0] == (key, None)]
+    assert len(entries) == 5  # the object, numeric, two value counts, crosstab
+
+
+def _categorical_survey(rows: int = 400) -> pd.DataFrame:
+    rng = np.random.default_rng(3)
+    df = pd.DataFrame({f"Q{i}": rng.choice(list("abcde")[: 2 + i % 4], rows) for i in range(6)})
+    df["Q1"] = np.where(rng.random(rows) < 0.8, df["Q0"], df["Q1"])  # one strong association
+    df.loc[rng.random(rows) < 0.1, "Q2"] = None
+    # free-text / ID answers: above the cardinality cap, never paired
+    df["respondent_id"] = [f"R{i:07d}" for i in range(rows)]
+    return df
+
+
+@pytest.mark.parametrize("batch_cells", [survey_stats.ASSOCIATION_BATCH_CELLS, 500])
+def test_association_screen_matches_chi2_contingency(monkeypatch, batch_cells):
+    # a small batch splits the pairs into many chunks; the results must not change
+    monkeypatch.setattr(survey_stats, "ASSOCIATION_BATCH_CELLS", batch_cells)
+    df = _categorical_survey()
+    screen = association_screen(df)
+    assert len(screen) == 15
+    assert "respondent_id" not in set(screen["var_a"]) | set(screen["var_b"])
+    assert {screen.loc[0, "var_a"], screen.loc[0, "var_b"]} == {"Q0", "Q1"}
+    for row in screen.itertuples():
+        table = pd.crosstab(df[row.var_a], df[row.var_b])
+        chi2, p, dof, _ = scipy_stats.chi2_contingency(table)
+        assert row.n == table.to_numpy().sum() and row.dof == dof
+        assert row.chi2 == pytest.approx(chi2) and row.p_value == pytest.approx(p)